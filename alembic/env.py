@@ -52,7 +52,20 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
+    """Run migrations in 'online' mode.
+
+    A caller may pass an open connection via config.attributes["connection"]
+    (e.g. tests running several upgrades on one connection); it is used as-is.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     from apps.api.db import DATABASE_URL
 
     configuration = config.get_section(config.config_ini_section, {})
@@ -0,0 +1,26 @@
+"""Replace eval_result (tenant_id, run_id) index with (tenant_id, run_id, domain)."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "017_eval_result_tenant_run_domain_index"
+down_revision: Union[str, None] = "016_scheduler_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite serves both run-only and run+domain lookups, so the old prefix index is dropped.
+    op.create_index(
+        "ix_eval_result_tenant_run_domain",
+        "eval_result",
+        ["tenant_id", "run_id", "domain"],
+        unique=False,
+    )
+    op.drop_index("ix_eval_result_tenant_run", table_name="eval_result")
+
+
+def downgrade() -> None:
+    op.create_index("ix_eval_result_tenant_run", "eval_result", ["tenant_id", "run_id"], unique=False)
+    op.drop_index("ix_eval_result_tenant_run_domain", table_name="eval_result")
@@ -28,6 +28,9 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 
+# Engine URLs already bootstrapped by ensure_tables() in this process (skip repeated DDL round-trips)
+_ensured_urls: set[str] = set()
+
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -46,6 +49,7 @@ def get_db() -> Generator[Session, None, None]:
 def ensure_tables(bind=None):
     """Create all tables if they do not exist. Idempotent (checkfirst=True).
     bind: optional engine/connection; if None, uses global engine.
+    With the global engine, runs at most once per process per database URL; an explicit bind always runs.
     """
     url = os.environ.get("DATABASE_URL", "")
     is_postgres = url.strip().lower().startswith("postgresql")
@@ -58,7 +62,14 @@ def ensure_tables(bind=None):
     # Postgres guard: prefer Alembic in dev/prod; only run create_all for ensure_tables in tests
     if is_postgres and not (in_test and strategy == "ensure_tables"):
         return
-    _create_all_safe(bind if bind is not None else engine)
+    if bind is not None:
+        _create_all_safe(bind)
+        return
+    key = engine.url.render_as_string(hide_password=False)
+    if key in _ensured_urls:
+        return
+    _create_all_safe(engine)
+    _ensured_urls.add(key)
 
 
 def _create_all_safe(bind) -> None:
@@ -14,7 +14,7 @@ class EvalResult(Base):
 
     __tablename__ = "eval_result"
     __table_args__ = (
-        Index("ix_eval_result_tenant_run", "tenant_id", "run_id"),
+        Index("ix_eval_result_tenant_run_domain", "tenant_id", "run_id", "domain"),
         Index("ix_eval_result_tenant_domain", "tenant_id", "domain"),
     )
 
@@ -6,6 +6,9 @@ Provides:
   - Joins MUST enforce tenant_id on each table involved (not just one).
 """
 
+from functools import lru_cache
+from typing import Any
+
 from sqlalchemy import BinaryExpression, Select, select
 
 from apps.api.models.ac_embedding import ACEmbedding
@@ -22,12 +25,19 @@ from apps.api.models.relation import Relation
 from apps.api.models.section import Section
 
 
-def tenant_where(model: type, tenant_id: str) -> BinaryExpression[bool]:
-    """Return WHERE clause: model.tenant_id == tenant_id. Use for filters and joins."""
+@lru_cache(maxsize=64)
+def _tenant_col(model: type) -> Any:
+    """model.tenant_id, resolved once per model (the ORM descriptor lookup is per call otherwise)."""
     col = getattr(model, "tenant_id", None)
     if col is None:
         raise ValueError(f"Model {model.__name__} has no tenant_id column")
-    return col == tenant_id
+    return col
+
+
+def tenant_where(model: type, tenant_id: str) -> BinaryExpression[bool]:
+    """Return WHERE clause: model.tenant_id == tenant_id. Use for filters and joins.
+    tenant_id stays an anonymous bind, so SQLAlchemy's compiled-statement cache is shared across tenants."""
+    return _tenant_col(model) == tenant_id
 
 
 def select_raw_page_for_tenant(tenant_id: str) -> Select[tuple[RawPage]]:
@@ -14,7 +14,9 @@ router = APIRouter()
 
 
 @router.post("/answer", response_model=AnswerResponse)
-async def answer(body: AnswerRequest, tenant_id: TenantId) -> AnswerResponse:
+def answer(body: AnswerRequest, tenant_id: TenantId) -> AnswerResponse:
     """Generate a grounded answer from retrieval. Tenant from auth only.
-    If no evidence available, returns refused=false with empty answer/claims (valid evaluation, 0% metrics)."""
+    If no evidence available, returns refused=false with empty answer/claims (valid evaluation, 0% metrics).
+    Plain def: FastAPI runs it in the threadpool, so the blocking pipeline (and the service's
+    single-flight wait on a threading.Event) never stalls the event loop."""
     return answer_service(body.query, tenant_id)
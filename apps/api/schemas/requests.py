@@ -1,4 +1,5 @@
-"""Request schemas for API endpoints. tenant_id is never accepted in payload."""
+"""Request schemas for API endpoints. tenant_id is never accepted in payload.
+Bodies are strict (no str->int coercion) and frozen (routes only read them)."""
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -6,7 +7,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class RetrieveRequest(BaseModel):
     """Request body for POST /retrieve/ac."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", strict=True, frozen=True)
 
     query: str = Field(..., description="Search query")
     k: int = Field(20, description="Number of candidates to return")
@@ -15,7 +16,7 @@ class RetrieveRequest(BaseModel):
 class RetrieveECRequest(BaseModel):
     """Request body for POST /retrieve/ec."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", strict=True, frozen=True)
 
     query: str = Field(..., description="Search query")
     k: int = Field(20, description="Number of entities to return")
@@ -25,6 +26,6 @@ class RetrieveECRequest(BaseModel):
 class AnswerRequest(BaseModel):
     """Request body for POST /answer."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", strict=True, frozen=True)
 
     query: str = Field(..., description="Question to answer")
@@ -1,8 +1,12 @@
 """Grounded answer service. Uses LLM + grounding validator. Caches answers by tenant+query+versions."""
 
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 
 from apps.api.db import get_db
@@ -23,10 +27,35 @@ from apps.api.services.repo import get_index_versions, get_section_by_id, insert
 from apps.api.services.retrieve import retrieve_ac
 from apps.api.services.span import select_quote_span
 
+try:
+    from prometheus_client import Counter
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 MAX_EVIDENCE_ITEMS = 5
 
+# Process-local tier in front of the shared answer_cache table. Keys carry the
+# index/policy versions, so a version bump is a miss here too; entries keep the TTL.
+_LOCAL_CACHE_MAX = 1024
+_local_cache: OrderedDict[str, tuple[float | None, dict[str, Any]]] = OrderedDict()
+_local_lock = threading.RLock()
+
+# Single-flight: one caller per cache key runs the pipeline; concurrent misses on the same key
+# wait for it (bounded) and then read the local tier instead of repeating retrieve + LLM.
+# Callers must be on threads: the /answer route is a plain def, so a waiter blocks a threadpool worker.
+_inflight: dict[str, threading.Event] = {}
+_SINGLE_FLIGHT_WAIT_SECONDS = 30.0
+
+# Cache hit/miss counters (no-op without prometheus_client). tenant label is a short hash so
+# label cardinality stays bounded and raw tenant ids stay out of the metrics backend.
+if PROMETHEUS_AVAILABLE:
+    _CACHE_HITS = Counter("answer_cache_hits_total", "Answer cache hits", ["tenant", "layer"])
+    _CACHE_MISSES = Counter("answer_cache_misses_total", "Answer cache misses (pipeline ran)", ["tenant"])
+
 # Prompt requires strict JSON output, no prose outside
 ANSWER_PROMPT = """You are a grounded answer assistant. Given a query and evidence, return ONLY a valid JSON object.
 Schema: {"answer": "<concise answer string>", "claims": [{"text": "<claim>", "evidence_ids": ["<id>", ...], "confidence": <0-1>}]}
@@ -108,41 +137,123 @@ def _answer_cache_ttl() -> int | None:
         return None
 
 
+def _local_cache_get(key: str) -> dict[str, Any] | None:
+    """Return the locally cached payload for key, or None if absent or expired."""
+    with _local_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del _local_cache[key]
+            return None
+        _local_cache.move_to_end(key)
+        return payload
+
+
+def _local_cache_set(key: str, payload: dict[str, Any], ttl_seconds: int | None) -> None:
+    """Store payload under key, evicting the least recently used entry when full.
+    ttl_seconds None or <= 0 means no expiry, matching cache_set for the shared tier."""
+    expires_at = time.monotonic() + ttl_seconds if ttl_seconds is not None and ttl_seconds > 0 else None
+    with _local_lock:
+        _local_cache[key] = (expires_at, payload)
+        _local_cache.move_to_end(key)
+        if len(_local_cache) > _LOCAL_CACHE_MAX:
+            _local_cache.popitem(last=False)
+
+
+def _tenant_label(tenant_id: str) -> str:
+    """First 8 hex chars of sha256(tenant_id): stable per tenant, not reversible."""
+    return hashlib.sha256(tenant_id.encode("utf-8")).hexdigest()[:8]
+
+
+def _record_cache_lookup(tenant_id: str, layer: str | None) -> None:
+    """Count a hit on layer ("local" | "shared"), or a miss when layer is None."""
+    if not PROMETHEUS_AVAILABLE:
+        return
+    if layer is None:
+        _CACHE_MISSES.labels(tenant=_tenant_label(tenant_id)).inc()
+    else:
+        _CACHE_HITS.labels(tenant=_tenant_label(tenant_id), layer=layer).inc()
+
+
+def _claim_inflight(key: str) -> tuple[bool, threading.Event]:
+    """Return (True, event) if this caller now owns key, else (False, owner's event)."""
+    with _local_lock:
+        evt = _inflight.get(key)
+        if evt is not None:
+            return False, evt
+        evt = _inflight[key] = threading.Event()
+        return True, evt
+
+
+def _release_inflight(key: str, evt: threading.Event) -> None:
+    """Drop ownership of key and wake its waiters."""
+    with _local_lock:
+        if _inflight.get(key) is evt:
+            del _inflight[key]
+    evt.set()
+
+
 def answer(query: str, tenant_id: str) -> AnswerResponse:
     """
     Retrieve candidates, create evidence, call LLM, run grounding validator.
-    Uses cache keyed by tenant+query+ac_version_hash+ec_version_hash+crawl_policy_version.
-    Skips cache when DB unavailable (e.g. tests without Postgres).
+    Uses cache keyed by tenant+query+ac_version_hash+ec_version_hash+crawl_policy_version:
+    a process-local LRU first, then the shared answer_cache table. Concurrent misses on one key
+    run the pipeline once. Skips cache when DB unavailable (e.g. tests without Postgres).
     """
-    skip_cache = False
     try:
         ac_hash, ec_hash = get_index_versions(tenant_id)
     except Exception:
-        ac_hash, ec_hash = "", ""
-        skip_cache = True
+        return _answer_impl(query, tenant_id)
+
+    policy = load_policy()
+    crawl_ver = get_crawl_policy_version(policy)
+    norm_q = normalize_query(query)
+    qhash = compute_query_hash(norm_q)
+    key = make_cache_key(tenant_id, qhash, ac_hash, ec_hash, crawl_ver)
+
+    cached = _local_cache_get(key)
+    if cached is not None:
+        _record_cache_lookup(tenant_id, "local")
+        return AnswerResponse.model_validate(cached)
+    owner, inflight = _claim_inflight(key)
+    if not owner:
+        inflight.wait(_SINGLE_FLIGHT_WAIT_SECONDS)
+        cached = _local_cache_get(key)
+        if cached is not None:
+            _record_cache_lookup(tenant_id, "local")
+            return AnswerResponse.model_validate(cached)
+    try:
+        return _answer_cached_miss(query, tenant_id, key, qhash)
+    finally:
+        if owner:
+            _release_inflight(key, inflight)
 
-    if not skip_cache:
-        policy = load_policy()
-        crawl_ver = get_crawl_policy_version(policy)
-        norm_q = normalize_query(query)
-        qhash = compute_query_hash(norm_q)
-        key = make_cache_key(tenant_id, qhash, ac_hash, ec_hash, crawl_ver)
 
-        try:
-            with get_db() as session:
-                cached = cache_get(session, key, tenant_id)
-            if cached is not None:
-                return AnswerResponse.model_validate(cached)
-        except Exception:
-            skip_cache = True
+def _answer_cached_miss(query: str, tenant_id: str, key: str, qhash: str) -> AnswerResponse:
+    """Local tier missed: try the shared answer_cache, else run the pipeline and fill both tiers."""
+    skip_cache = False
+    try:
+        with get_db() as session:
+            cached = cache_get(session, key, tenant_id)
+        if cached is not None:
+            _local_cache_set(key, cached, _answer_cache_ttl())
+            _record_cache_lookup(tenant_id, "shared")
+            return AnswerResponse.model_validate(cached)
+    except Exception:
+        skip_cache = True
 
+    _record_cache_lookup(tenant_id, None)
     result = _answer_impl(query, tenant_id)
 
     if not skip_cache:
         try:
             payload = result.model_dump(mode="json")
+            ttl = _answer_cache_ttl()
             with get_db() as session:
-                cache_set(session, key, tenant_id, qhash, payload, ttl_seconds=_answer_cache_ttl())
+                cache_set(session, key, tenant_id, qhash, payload, ttl_seconds=ttl)
+            _local_cache_set(key, payload, ttl)
         except Exception:
             pass
 
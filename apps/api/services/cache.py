@@ -4,7 +4,6 @@ import hashlib
 import logging
 import os
 import json
-import re
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -13,18 +12,57 @@ from sqlalchemy.orm import Session
 
 from apps.api.models.answer_cache import AnswerCache
 from apps.api.repositories.tenant_filters import tenant_where
+from apps.api.services.normalize import _hash_algo
 from apps.api.services.tenant_guard import require_tenant_id
 
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_payload(payload: dict[str, Any]) -> str:
+    """Serialize a cache payload to JSON text; orjson when installed (payloads are model_dump(mode="json"))."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def _loads_payload(payload_json: str) -> dict[str, Any]:
+    """Parse cached JSON text; orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload_json)
+    return json.loads(payload_json)
+
 
 def normalize_query(q: str) -> str:
     """Trim, collapse whitespace, lowercase."""
     if not q:
         return ""
-    return " ".join(re.split(r"\s+", q.strip().lower()))
+    # str.split() with no separator splits on whitespace runs and drops ends (same as strip + re.split(r"\s+"))
+    return " ".join(q.lower().split())
 
 
 def compute_query_hash(normalized_query: str) -> str:
-    """SHA256 of normalized query, first 16 hex chars."""
+    """SHA256 of normalized query, first 16 hex chars.
+    HASH_ALGO=xxh3: "xxh3_" + xxh3_64 hex (non-cryptographic, cheaper per request); the prefix keeps
+    the two schemes apart, so switching only causes cache misses, never a wrong hit."""
+    algo = _hash_algo()
+    if algo == "xxh3":
+        if not XXHASH_AVAILABLE:
+            raise RuntimeError("HASH_ALGO=xxh3 requires the xxhash package. Fix: pip install xxhash")
+        return "xxh3_" + xxhash.xxh3_64_hexdigest(normalized_query.encode("utf-8"))
+    if algo != "sha256":
+        raise RuntimeError(f"HASH_ALGO must be 'sha256' or 'xxh3'. Got: {algo!r}")
     return hashlib.sha256(normalized_query.encode("utf-8")).hexdigest()[:16]
 
 
@@ -79,7 +117,7 @@ def cache_get(db: Session, key: str, tenant_id: str) -> dict[str, Any] | None:
         return None
     if row.expires_at and row.expires_at < datetime.now(timezone.utc):
         return None
-    return json.loads(row.payload_json)
+    return _loads_payload(row.payload_json)
 
 
 def cache_set(
@@ -91,7 +129,7 @@ def cache_set(
     ttl_seconds: int | None = None,
 ) -> None:
     """Insert or replace cache entry."""
-    payload_json = json.dumps(payload, ensure_ascii=False)
+    payload_json = _dumps_payload(payload)
     expires_at = None
     if ttl_seconds is not None and ttl_seconds > 0:
         expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
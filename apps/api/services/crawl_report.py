@@ -3,12 +3,39 @@
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+
+try:
+    import msgspec
+
+    # One decoder instance, reused for every line (msgspec caches its parse state per decoder)
+    _decode_line: Callable[[bytes], Any] = msgspec.json.Decoder(dict).decode
+    _DECODE_ERRORS: tuple[type[Exception], ...] = (msgspec.DecodeError, ValueError)
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    _decode_line = json.loads
+    _DECODE_ERRORS = (ValueError,)
+    MSGSPEC_AVAILABLE = False
 
 # Default report path: eval/reports/crawl_report.jsonl (relative to project root)
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 DEFAULT_REPORT_PATH = _PROJECT_ROOT / "eval" / "reports" / "crawl_report.jsonl"
 
+# Read buffer for streaming large reports (fewer read syscalls than the 8 KiB default)
+_READ_BUFFER_SIZE = 1 << 20
+
+# Report directories already created in this process (append_jsonl runs once per crawled URL)
+_created_dirs: set[Path] = set()
+
+
+def _ensure_parent_dir(p: Path) -> None:
+    """mkdir -p the parent of p, at most once per process per directory."""
+    parent = p.parent
+    if parent in _created_dirs:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    _created_dirs.add(parent)
+
 
 def append_jsonl(path: str | Path, record: dict[str, Any]) -> None:
     """
@@ -16,12 +43,43 @@ def append_jsonl(path: str | Path, record: dict[str, Any]) -> None:
     Creates parent directories if they do not exist.
     """
     p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_parent_dir(p)
     line = json.dumps(record, ensure_ascii=False) + "\n"
-    with open(p, "a", encoding="utf-8") as f:
+    try:
+        f = open(p, "a", encoding="utf-8")
+    except FileNotFoundError:
+        # Directory removed since it was cached; recreate once.
+        _created_dirs.discard(p.parent)
+        _ensure_parent_dir(p)
+        f = open(p, "a", encoding="utf-8")
+    with f:
         f.write(line)
 
 
+def iter_jsonl(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Stream JSON records from a JSONL file, one line at a time.
+    Reads bytes with a large buffer and skips blank, malformed or non-object lines.
+    Uses a reusable msgspec decoder when installed, else stdlib json (same records either way).
+    Yields nothing if the file does not exist.
+    """
+    p = Path(path)
+    if not p.exists():
+        return
+    with open(p, "rb", buffering=_READ_BUFFER_SIZE) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = _decode_line(line)
+            except _DECODE_ERRORS:
+                continue
+            # msgspec's Decoder(dict) already rejects arrays/scalars; json.loads does not
+            if isinstance(record, dict):
+                yield record
+
+
 def write_crawl_record(
     *,
     tenant_id: str,
@@ -1,6 +1,8 @@
 """Crawl rules: classify URLs into allowed/quote_flow/info_static."""
 
-from urllib.parse import parse_qs, urlparse
+import functools
+import re
+from urllib.parse import parse_qsl, urlparse
 
 # Hosts where we allow ONLY informational/static pages, exclude quote flows
 RESTRICTIVE_HOSTS = {"quote.unitedglobalvanline.com"}
@@ -38,6 +40,13 @@ DENY_QUERY_PREFIXES = ["utm_"]
 QUOTE_FLOW_PATH_PREFIXES = DENY_PATH_PREFIXES
 QUOTE_FLOW_QUERY_KEYS = DENY_QUERY_KEYS
 
+# Precompiled matchers built once from the lists above (lists stay the public config).
+# Alternation order follows DENY_PATH_PREFIXES, so the reported prefix is the same first match as a list scan.
+_DENY_PATH_PREFIX_RE = re.compile("|".join(re.escape(p.lower()) for p in DENY_PATH_PREFIXES))
+_DENY_PATH_SUBSTRINGS = tuple(s.lower() for s in DENY_PATH_SUBSTRINGS)
+_DENY_QUERY_KEYS = frozenset(k.lower() for k in DENY_QUERY_KEYS)
+_DENY_QUERY_PREFIXES = tuple(p.lower() for p in DENY_QUERY_PREFIXES)
+
 PAGE_TYPE_INFO_STATIC = "info_static"
 PAGE_TYPE_QUOTE_FLOW = "quote_flow"
 PAGE_TYPE_UNKNOWN = "unknown"
@@ -59,24 +68,24 @@ def _is_quote_flow(path: str, query: str) -> tuple[bool, str]:
     """Check if path/query indicates quote flow. Returns (is_quote_flow, reason)."""
     path_lower = (path or "/").lower()
     # Deny on path prefix
-    for prefix in DENY_PATH_PREFIXES:
-        if path_lower.startswith(prefix.lower()):
-            return True, f"path starts with quote-flow prefix {prefix!r}"
+    m = _DENY_PATH_PREFIX_RE.match(path_lower)
+    if m:
+        return True, f"path starts with quote-flow prefix {m.group(0)!r}"
     # Deny on path substring
-    for substr in DENY_PATH_SUBSTRINGS:
+    for substr in _DENY_PATH_SUBSTRINGS:
         if substr in path_lower:
             return True, f"path contains denied substring {substr!r}"
+    if not query:
+        return False, ""
     # Deny on exact query keys (normalize to lowercase)
-    qs = parse_qs(query, keep_blank_values=True)
-    qkeys_lower = {k.lower() for k in qs.keys()}
-    deny_keys_lower = {k.lower() for k in DENY_QUERY_KEYS}
-    found = qkeys_lower & deny_keys_lower
+    qkeys_lower = {k.lower() for k, _ in parse_qsl(query, keep_blank_values=True)}
+    found = qkeys_lower & _DENY_QUERY_KEYS
     if found:
         return True, f"query contains quote-flow keys {sorted(found)!r}"
     # Deny on query key prefix (utm_*)
-    for prefix in DENY_QUERY_PREFIXES:
+    for prefix in _DENY_QUERY_PREFIXES:
         for qk in qkeys_lower:
-            if qk.startswith(prefix.lower()):
+            if qk.startswith(prefix):
                 return True, f"query key prefix denied {prefix!r}"
     return False, ""
 
@@ -87,6 +96,13 @@ def classify_url(url: str) -> tuple[bool, str, str]:
     Returns (allowed, page_type, reason).
     page_type: "info_static" | "quote_flow" | "unknown"
     """
+    return _classify(url)
+
+
+# Pure function of the URL (matchers above are fixed at import): callers re-check the same
+# URL across crawl stages, so parse + match once per URL. Bounded to cap memory on long crawls.
+@functools.lru_cache(maxsize=4096)
+def _classify(url: str) -> tuple[bool, str, str]:
     try:
         parsed = urlparse(url)
     except Exception as e:
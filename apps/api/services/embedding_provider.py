@@ -10,6 +10,7 @@ No import-time model loading; everything is lazy.
 import hashlib
 import logging
 import os
+from collections.abc import Sequence
 from typing import Protocol, runtime_checkable
 
 logger = logging.getLogger(__name__)
@@ -147,3 +148,8 @@ def embed_texts(texts: list[str]) -> list[list[float]]:
     if not texts:
         return []
     return get_embedding_provider().embed(texts)
+
+
+def vector_literal(values: Sequence[float]) -> str:
+    """pgvector text literal "[x,y,...]" for CAST(:embedding AS vector) query params."""
+    return "[" + ",".join(map(str, values)) + "]"
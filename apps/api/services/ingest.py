@@ -8,7 +8,7 @@ from apps.api.services.extract import extract_main_text
 from apps.api.services.index_ec import index_ec
 from apps.api.services.metadata import extract_domain
 from apps.api.services.normalize import content_hash
-from apps.api.services.repo import get_latest_raw_page_by_canonical_url, insert_raw_page
+from apps.api.services.repo import insert_raw_page_if_changed
 
 logger = logging.getLogger(__name__)
 
@@ -48,31 +48,27 @@ def ingest_page(
         new_hash = content_hash(text)
     logger.info("Ingesting url=%s text_len=%d content_hash=%s", url, len(text), new_hash[:16])
 
-    latest = get_latest_raw_page_by_canonical_url(tenant_id, final_url)
-    if latest is None:
-        version = 1
-    elif latest["content_hash"] == new_hash:
-        logger.info("raw_page unchanged url=%s raw_page_id=%s", url, latest["id"])
-        return {"raw_page_id": latest["id"], "unchanged": True, "changed": False}
-    else:
-        version = latest["version"] + 1
-    raw_page_id = insert_raw_page(
+    # Single round-trip: compares against the latest version and inserts version+1 only if the hash differs.
+    row = insert_raw_page_if_changed(
         tenant_id,
         url,
         canonical_url=final_url,
+        content_hash=new_hash,
         html=html,
         text=text,
         status_code=status_code,
         fetched_at=fetched_at,
-        content_hash=new_hash,
-        version=version,
         domain=domain,
         page_type=page_type,
         crawl_policy_version=crawl_policy_version,
         crawl_decision=crawl_decision,
         crawl_reason=crawl_reason,
     )
-    logger.info("Stored raw_page id=%s url=%s version=%s", raw_page_id, url, version)
+    raw_page_id = row["id"]
+    if not row["inserted"]:
+        logger.info("raw_page unchanged url=%s raw_page_id=%s", url, raw_page_id)
+        return {"raw_page_id": raw_page_id, "unchanged": True, "changed": False}
+    logger.info("Stored raw_page id=%s url=%s version=%s", raw_page_id, url, row["version"])
     return {"raw_page_id": raw_page_id, "unchanged": False, "changed": True}
 
 
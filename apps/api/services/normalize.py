@@ -1,8 +1,16 @@
 """Deterministic text normalization and content hashing."""
 
 import hashlib
+import os
 import re
 
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 
 def normalize_text(text: str) -> str:
     """
@@ -21,7 +29,22 @@ def normalize_text(text: str) -> str:
     return "\n".join(lines)
 
 
+def _hash_algo() -> str:
+    """HASH_ALGO env: 'sha256' (default) or 'xxh3'."""
+    return (os.getenv("HASH_ALGO") or "sha256").strip().lower()
+
+
 def content_hash(text: str) -> str:
-    """Return SHA256 hex digest of normalized text."""
-    normalized = normalize_text(text)
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    """Return hex digest of normalized text.
+    Default SHA256 (64 hex chars). HASH_ALGO=xxh3 uses xxh3_128 (32 hex chars): equality-only, much faster
+    on large pages. Switching algorithms makes every existing raw_page look changed on its next crawl.
+    """
+    data = normalize_text(text).encode("utf-8")
+    algo = _hash_algo()
+    if algo == "xxh3":
+        if not XXHASH_AVAILABLE:
+            raise RuntimeError("HASH_ALGO=xxh3 requires the xxhash package. Fix: pip install xxhash")
+        return xxhash.xxh3_128_hexdigest(data)
+    if algo != "sha256":
+        raise RuntimeError(f"HASH_ALGO must be 'sha256' or 'xxh3'. Got: {algo!r}")
+    return hashlib.sha256(data).hexdigest()
@@ -11,7 +11,7 @@ from apps.api.services.crawl import fetch_html_with_meta
 
 # Stable ordered stages for deterministic pipeline execution (no set/dict iteration).
 # Patch target for tests: patch apps.api.services.pipeline._fetch (where pipeline imports it).
-PIPELINE_STAGES = (
+PIPELINE_STAGES: tuple[str, ...] = (
     "url_exclusion",
     "domain_gate",
     "fetch",
@@ -21,6 +21,8 @@ PIPELINE_STAGES = (
     "sectionize",
     "index_ac",
 )
+if type(PIPELINE_STAGES) is not tuple or len(set(PIPELINE_STAGES)) != len(PIPELINE_STAGES):
+    raise RuntimeError("PIPELINE_STAGES must be a tuple of unique stage names")
 
 
 def _fetch(url: str) -> dict[str, Any]:
@@ -6,15 +6,18 @@ All tenant-scoped queries MUST use tenant_filters (select_*_for_tenant / tenant_
 GUARD: Every function MUST call require_tenant_id(tenant_id) before any DB access.
 """
 
+import json
 import logging
-from collections.abc import Sequence
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Float, Integer, case, cast, delete, func, or_, select, text
+from sqlalchemy import Float, Integer, Row, case, cast, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
 
-from apps.api.db import get_db
 from apps.api.models.ac_embedding import ACEmbedding
 from apps.api.models.ec_embedding import ECEmbedding
 from apps.api.models.domain_index_state import DomainIndexState
@@ -49,6 +52,15 @@ from apps.api.schemas.eval import EvalResultCreate
 from apps.api.services.tenant_guard import TenantRequiredError, require_tenant_id
 
 
+@contextmanager
+def _get_db() -> Iterator[Session]:
+    """apps.api.db.get_db, imported on first use: importing repo (e.g. the guard/lint tests) builds no engine."""
+    from apps.api.db import get_db
+
+    with get_db() as session:
+        yield session
+
+
 def _assert_tenant(tenant_id: str | None) -> None:
     """Legacy guard; prefer require_tenant_id. Raises if tenant_id missing."""
     require_tenant_id(tenant_id)
@@ -63,7 +75,7 @@ def get_existing_ac_section_ids(
     stmt = select_ac_embedding_for_tenant(tenant_id).with_only_columns(ACEmbedding.section_id)
     if domain is not None:
         stmt = stmt.where(ACEmbedding.domain == domain)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
         return {r[0] for r in rows}
 
@@ -76,7 +88,7 @@ def insert_ac_embeddings(
     tenant_id = require_tenant_id(tenant_id)
     if not records:
         return
-    with get_db() as session:
+    with _get_db() as session:
         objs = [
             ACEmbedding(
                 tenant_id=tenant_id,
@@ -121,7 +133,7 @@ def execute_ac_bm25_retrieval(
     params: dict[str, Any] = {"tenant_id": tenant_id, "query": q, "config": fts_config, "k": k}
     if domain is not None:
         params["domain"] = domain
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(sql, params).fetchall()
 
 
@@ -152,7 +164,7 @@ def execute_ac_retrieval(
     params: dict[str, Any] = {"tenant_id": tenant_id, "embedding": embedding_str, "k": k}
     if domain is not None:
         params["domain"] = domain
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(sql, params).fetchall()
 
 
@@ -167,7 +179,7 @@ def get_raw_page_metadata(
         .where(RawPage.id == raw_page_id)
         .with_only_columns(RawPage.domain, RawPage.page_type, RawPage.crawl_policy_version, RawPage.version)
     )
-    with get_db() as session:
+    with _get_db() as session:
         row = session.execute(stmt).first()
         if not row:
             return {}
@@ -182,7 +194,7 @@ def get_raw_page_url(tenant_id: str | None, raw_page_id: int) -> str | None:
         .where(RawPage.id == raw_page_id)
         .with_only_columns(RawPage.url, RawPage.canonical_url)
     )
-    with get_db() as session:
+    with _get_db() as session:
         row = session.execute(stmt).first()
         if not row:
             return None
@@ -196,7 +208,7 @@ def get_sections_by_raw_page_id(
     """Return section records for a raw_page. Always filter by tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_section_for_tenant(tenant_id).where(Section.raw_page_id == raw_page_id)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return [
             {
@@ -224,7 +236,7 @@ def get_artifact_counts_for_raw_page(
     Strict: tenant_id + raw_page_id for sections; ac/ec scoped to those section_ids.
     """
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         sections_stmt = (
             select(func.count(Section.id))
             .select_from(Section)
@@ -274,7 +286,7 @@ def delete_ac_embeddings_for_section_ids(
         tenant_where(ACEmbedding, tenant_id),
         ACEmbedding.section_id.in_(list(section_ids)),
     )
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(stmt)
         return result.rowcount or 0
 
@@ -295,7 +307,7 @@ def delete_ec_embeddings_for_section_ids(
         tenant_where(ECEmbedding, tenant_id),
         ECEmbedding.entity_id.in_(entity_ids_subq),
     )
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(stmt)
         return result.rowcount or 0
 
@@ -304,7 +316,7 @@ def get_sections_for_tenant(tenant_id: str | None) -> list[dict[str, Any]]:
     """Return all section records for tenant. Always filter by tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_section_for_tenant(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return [
             {
@@ -326,7 +338,7 @@ def get_sections_by_domain(tenant_id: str | None, domain: str) -> list[dict[str,
     """Return section records for tenant filtered by domain. Always filter by tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_section_for_tenant(tenant_id).where(Section.domain == domain)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return [
             {
@@ -355,7 +367,7 @@ def get_entity_ids_for_sections(tenant_id: str | None, section_ids: Sequence[str
         .where(tenant_where(Entity, tenant_id), Entity.section_id.in_(section_ids))
         .distinct()
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return list(rows)
 
@@ -363,7 +375,7 @@ def get_entity_ids_for_sections(tenant_id: str | None, section_ids: Sequence[str
 def get_domain_index_state(tenant_id: str | None, domain: str) -> dict[str, Any] | None:
     """Return current domain_index_state row for (tenant_id, domain), or None. Tenant-scoped."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = session.get(DomainIndexState, (tenant_id, domain))
         if row is None:
             return None
@@ -386,7 +398,7 @@ def get_domain_index_states_for_tenant(tenant_id: str | None) -> dict[str, dict[
     """Return all domain_index_state rows for tenant, keyed by domain. For list_domains join."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select(DomainIndexState).where(DomainIndexState.tenant_id == tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
     return {
         str(r.domain): {
@@ -407,7 +419,7 @@ def upsert_domain_index_state(
     tenant_id = require_tenant_id(tenant_id)
     allowed = {"ac_version_hash", "ec_version_hash", "crawl_policy_version", "status", "last_indexed_at", "last_error", "error_code"}
     updates = {k: v for k, v in fields.items() if k in allowed}
-    with get_db() as session:
+    with _get_db() as session:
         row = session.get(DomainIndexState, (tenant_id, domain))
         if row is not None:
             for key, value in updates.items():
@@ -440,7 +452,7 @@ def get_section_by_id(
         .where(Section.section_id == section_id)
         .with_only_columns(Section.text, Section.version_hash, Section.domain)
     )
-    with get_db() as session:
+    with _get_db() as session:
         row = session.execute(stmt).first()
         if not row:
             return None
@@ -455,7 +467,7 @@ def get_sections_by_query(
     """Return sections matching query for tenant. Always filter by tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_section_for_tenant(tenant_id).limit(k)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return [
             {
@@ -475,7 +487,7 @@ def count_raw_pages_by_domain(tenant_id: str | None, domain: str) -> int:
         .select_from(RawPage)
         .where(tenant_where(RawPage, tenant_id), RawPage.domain == domain)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -489,7 +501,7 @@ def count_raw_pages_by_crawl_policy_version(
         .select_from(RawPage)
         .where(tenant_where(RawPage, tenant_id), RawPage.crawl_policy_version == crawl_policy_version)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -501,7 +513,7 @@ def count_sections_by_domain(tenant_id: str | None, domain: str) -> int:
         .select_from(Section)
         .where(tenant_where(Section, tenant_id), Section.domain == domain)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -513,7 +525,7 @@ def count_ac_embeddings_by_domain(tenant_id: str | None, domain: str) -> int:
         .select_from(ACEmbedding)
         .where(tenant_where(ACEmbedding, tenant_id), ACEmbedding.domain == domain)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -525,7 +537,7 @@ def count_ec_embeddings_by_domain(tenant_id: str | None, domain: str) -> int:
         .select_from(ECEmbedding)
         .where(tenant_where(ECEmbedding, tenant_id), ECEmbedding.domain == domain)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -539,7 +551,7 @@ def count_sections_by_crawl_policy_version(
         .select_from(Section)
         .where(tenant_where(Section, tenant_id), Section.crawl_policy_version == crawl_policy_version)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(stmt).scalar() or 0
 
 
@@ -558,17 +570,31 @@ def get_raw_page_counts_by_domain_page_type(
         .where(tenant_where(RawPage, tenant_id))
         .group_by(RawPage.domain, RawPage.page_type)
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
         return [(r[0], r[1], r[2]) for r in rows]
 
 
+def get_raw_page_counts_by_page_type(tenant_id: str | None) -> dict[str, int]:
+    """Return {page_type: count} for tenant's raw_pages. Aggregated in SQL (GROUP BY page_type)."""
+    tenant_id = require_tenant_id(tenant_id)
+    page_type = func.coalesce(RawPage.page_type, "(empty)")
+    stmt = (
+        select(page_type, func.count(RawPage.id))
+        .select_from(RawPage)
+        .where(tenant_where(RawPage, tenant_id))
+        .group_by(page_type)
+    )
+    with _get_db() as session:
+        return {r[0]: r[1] for r in session.execute(stmt).all()}
+
+
 def get_section_stats_for_tenant(
     tenant_id: str | None,
 ) -> dict[str, float | int]:
     """Return {count, avg_chunk_length, min_chunk_length, max_chunk_length} for tenant's sections."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         count_stmt = select(func.count(Section.id)).select_from(Section).where(tenant_where(Section, tenant_id))
         count = session.execute(count_stmt).scalar() or 0
         if count == 0:
@@ -603,7 +629,7 @@ def get_table_counts_for_tenant(tenant_id: str | None) -> dict[str, int]:
         "relations": select(func.count(Relation.id)).select_from(Relation).where(tenant_where(Relation, tenant_id)),
         "ec_embeddings": select(func.count(ECEmbedding.id)).select_from(ECEmbedding).where(tenant_where(ECEmbedding, tenant_id)),
     }
-    with get_db() as session:
+    with _get_db() as session:
         return {k: session.execute(s).scalar() or 0 for k, s in stmts.items()}
 
 
@@ -614,7 +640,7 @@ def get_latest_raw_page_by_canonical_url(
     """Return latest raw_page for tenant+canonical_url, or None. Keys: id, version, content_hash.
     Ordered by version desc, id desc."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = (
             session.query(RawPage.id, RawPage.version, RawPage.content_hash)
             .filter(
@@ -648,7 +674,7 @@ def insert_raw_page(
 ) -> int:
     """Insert a raw_page and return its id."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = RawPage(
             tenant_id=tenant_id,
             url=url,
@@ -670,11 +696,79 @@ def insert_raw_page(
         return row.id
 
 
+# Latest-version lookup, version increment and conditional insert in one statement.
+# Returns one row: the inserted (id, version, true), or the unchanged latest (id, version, false).
+_INSERT_RAW_PAGE_IF_CHANGED_SQL = text("""
+    WITH latest AS (
+        SELECT id, version, content_hash FROM raw_page
+        WHERE tenant_id = :tenant_id AND canonical_url = :canonical_url
+        ORDER BY version DESC, id DESC
+        LIMIT 1
+    ),
+    ins AS (
+        INSERT INTO raw_page (
+            tenant_id, url, canonical_url, html, text, status_code, fetched_at, content_hash,
+            version, domain, page_type, crawl_policy_version, crawl_decision, crawl_reason
+        )
+        SELECT
+            :tenant_id, :url, :canonical_url, :html, :text,
+            CAST(:status_code AS integer), CAST(:fetched_at AS timestamptz), :content_hash,
+            COALESCE((SELECT version FROM latest), 0) + 1, :domain, :page_type,
+            :crawl_policy_version, :crawl_decision, :crawl_reason
+        WHERE NOT EXISTS (SELECT 1 FROM latest WHERE content_hash = :content_hash)
+        RETURNING id, version
+    )
+    SELECT id, version, true AS inserted FROM ins
+    UNION ALL
+    SELECT id, version, false AS inserted FROM latest WHERE content_hash = :content_hash
+""")
+
+
+def insert_raw_page_if_changed(
+    tenant_id: str | None,
+    url: str,
+    *,
+    canonical_url: str,
+    content_hash: str,
+    html: str | None = None,
+    text: str | None = None,
+    status_code: int | None = None,
+    fetched_at: datetime | None = None,
+    domain: str | None = None,
+    page_type: str | None = None,
+    crawl_policy_version: str | None = None,
+    crawl_decision: str | None = None,
+    crawl_reason: str | None = None,
+) -> dict[str, Any]:
+    """Insert raw_page version+1 unless the latest version for tenant+canonical_url has the same content_hash.
+    One round-trip (replaces get_latest_raw_page_by_canonical_url + insert_raw_page).
+    Returns {id, version, inserted}; inserted=False means unchanged (id/version of the latest row)."""
+    tenant_id = require_tenant_id(tenant_id)
+    params = {
+        "tenant_id": tenant_id,
+        "url": url,
+        "canonical_url": canonical_url,
+        "html": html,
+        "text": text,
+        "status_code": status_code,
+        "fetched_at": fetched_at,
+        "content_hash": content_hash,
+        "domain": domain,
+        "page_type": page_type,
+        "crawl_policy_version": crawl_policy_version,
+        "crawl_decision": crawl_decision,
+        "crawl_reason": crawl_reason,
+    }
+    with _get_db() as session:
+        row = session.execute(_INSERT_RAW_PAGE_IF_CHANGED_SQL, params).one()
+        return {"id": row[0], "version": row[1], "inserted": bool(row[2])}
+
+
 def delete_sections_for_raw_page(tenant_id: str | None, raw_page_id: int) -> int:
     """Delete all sections for a raw_page. Returns count deleted. Enforces tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = delete(Section).where(tenant_where(Section, tenant_id), Section.raw_page_id == raw_page_id)
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(stmt)
         return result.rowcount or 0
 
@@ -688,7 +782,7 @@ def insert_sections(
     tenant_id = require_tenant_id(tenant_id)
     if not sections:
         return
-    with get_db() as session:
+    with _get_db() as session:
         objs = [
             Section(
                 tenant_id=tenant_id,
@@ -722,7 +816,7 @@ def get_evidence_ids_by_section_ids(
         .where(Evidence.section_id.in_(list(section_ids)))
         .with_only_columns(Evidence.section_id, Evidence.evidence_id)
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
         out: dict[str, list[str]] = {sid: [] for sid in section_ids}
         for section_id, evidence_id in rows:
@@ -742,7 +836,7 @@ def get_evidence_by_ids(
     stmt = select_evidence_for_tenant(tenant_id).where(Evidence.evidence_id.in_(list(evidence_ids)))
     if domain is not None:
         stmt = stmt.where(Evidence.domain == domain)
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.scalars(stmt).all()
         return [
             {
@@ -769,7 +863,7 @@ def insert_evidence(
     tenant_id = require_tenant_id(tenant_id)
     if not evidence:
         return
-    with get_db() as session:
+    with _get_db() as session:
         objs = [
             Evidence(
                 tenant_id=tenant_id,
@@ -791,7 +885,7 @@ def delete_entity_mentions_for_tenant(tenant_id: str | None) -> int:
     """Delete all entity_mentions for tenant. Returns count deleted. Enforces tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = delete(EntityMention).where(tenant_where(EntityMention, tenant_id))
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(stmt)
         return result.rowcount or 0
 
@@ -804,7 +898,7 @@ def insert_entity_mentions(
     tenant_id = require_tenant_id(tenant_id)
     if not mentions:
         return
-    with get_db() as session:
+    with _get_db() as session:
         objs = [
             EntityMention(
                 tenant_id=tenant_id,
@@ -824,7 +918,7 @@ def delete_ec_embeddings_for_tenant(tenant_id: str | None) -> int:
     """Delete all ec_embeddings for tenant. Returns count deleted. Enforces tenant_id."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = delete(ECEmbedding).where(tenant_where(ECEmbedding, tenant_id))
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(stmt)
         return result.rowcount or 0
 
@@ -833,54 +927,74 @@ def insert_ec_embeddings(
     tenant_id: str | None,
     records: Sequence[dict[str, Any]],
 ) -> None:
-    """Bulk insert ec_embeddings. Each dict: entity_id, embedding, domain, model?, dim?."""
+    """Bulk insert ec_embeddings. Each dict: entity_id, embedding, domain, model?, dim?.
+    One Core INSERT executed with a list of row dicts (batched insertmanyvalues, no ORM objects);
+    embedding may be any sequence the pgvector bind accepts (list or array row)."""
     tenant_id = require_tenant_id(tenant_id)
     if not records:
         return
-    with get_db() as session:
-        objs = [
-            ECEmbedding(
-                tenant_id=tenant_id,
-                domain=r["domain"],
-                entity_id=r["entity_id"],
-                embedding=r["embedding"],
-                model=r.get("model"),
-                dim=r.get("dim"),
-            )
-            for r in records
-        ]
-        session.add_all(objs)
+    rows = [
+        {
+            "tenant_id": tenant_id,
+            "domain": r["domain"],
+            "entity_id": r["entity_id"],
+            "embedding": r["embedding"],
+            "model": r.get("model"),
+            "dim": r.get("dim"),
+        }
+        for r in records
+    ]
+    with _get_db() as session:
+        session.execute(insert(ECEmbedding), rows)
 
 
 def upsert_ec_version(tenant_id: str | None, version_hash: str) -> None:
     """Insert or update ec_version_hash for tenant."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         existing = session.get(ECVersion, tenant_id)
         if existing:
             existing.version_hash = version_hash
         else:
             session.add(ECVersion(tenant_id=tenant_id, version_hash=version_hash))
+    _index_versions_cache.pop(tenant_id, None)
 
 
 def get_ec_version(tenant_id: str | None) -> str | None:
     """Return ec_version_hash for tenant, or None."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = session.get(ECVersion, tenant_id)
         return row.version_hash if row else None
 
 
+# Process-local TTL cache for get_index_versions (read on every /answer to build the cache key).
+# tenant_id -> (expires_at monotonic, (ac_hash, ec_hash)). Writers in this process pop their tenant;
+# other processes see a version change after at most _INDEX_VERSIONS_TTL_S.
+_INDEX_VERSIONS_TTL_S = 5.0
+_INDEX_VERSIONS_MAX = 10_000
+_index_versions_cache: dict[str, tuple[float, tuple[str, str]]] = {}
+
+
 def get_index_versions(tenant_id: str | None) -> tuple[str, str]:
-    """Return (ac_version_hash, ec_version_hash) for tenant. Uses tenant_index_versions; falls back to ec_versions for ec if missing."""
-    tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    """Return (ac_version_hash, ec_version_hash) for tenant. Uses tenant_index_versions; falls back to ec_versions for ec if missing.
+    Cached in-process for _INDEX_VERSIONS_TTL_S seconds."""
+    tenant_id = require_tenant_id(tenant_id)
+    now = time.monotonic()
+    hit = _index_versions_cache.get(tenant_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    with _get_db() as session:
         row = session.get(TenantIndexVersion, tenant_id)
         if row:
-            return (row.ac_version_hash or "", row.ec_version_hash or "")
-        ec = session.get(ECVersion, tenant_id)
-        ec_hash = ec.version_hash if ec else ""
-        return ("", ec_hash)
+            versions = (row.ac_version_hash or "", row.ec_version_hash or "")
+        else:
+            ec = session.get(ECVersion, tenant_id)
+            versions = ("", ec.version_hash if ec else "")
+    if len(_index_versions_cache) >= _INDEX_VERSIONS_MAX:
+        _index_versions_cache.clear()
+    _index_versions_cache[tenant_id] = (now + _INDEX_VERSIONS_TTL_S, versions)
+    return versions
 
 
 def upsert_tenant_index_version(
@@ -891,7 +1005,7 @@ def upsert_tenant_index_version(
 ) -> None:
     """Insert or update tenant_index_versions. For tests: simulate re-ingest by changing ac_version_hash."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = session.get(TenantIndexVersion, tenant_id)
         if row:
             if ac_version_hash is not None:
@@ -906,6 +1020,7 @@ def upsert_tenant_index_version(
                     ec_version_hash=ec_version_hash or "",
                 )
             )
+    _index_versions_cache.pop(tenant_id, None)
 
 
 def upsert_entity(
@@ -919,7 +1034,7 @@ def upsert_entity(
         raise ValueError("entity_id is required")
     canonical = entity.get("canonical_name") or entity.get("name")
     stmt = select_entity_for_tenant(tenant_id).where(Entity.entity_id == entity_id)
-    with get_db() as session:
+    with _get_db() as session:
         existing = session.scalars(stmt).first()
         if existing:
             existing.name = entity.get("name") or canonical
@@ -951,7 +1066,7 @@ def insert_relation(
     obj = relation.get("object_entity_id")
     if not subj or not obj:
         raise ValueError("subject_entity_id and object_entity_id are required")
-    with get_db() as session:
+    with _get_db() as session:
         session.add(
             Relation(
                 tenant_id=tenant_id,
@@ -983,7 +1098,7 @@ def execute_ec_retrieval(
     params: dict[str, Any] = {"tenant_id": tenant_id, "embedding": embedding_str, "k": k}
     if domain is not None:
         params["domain"] = domain
-    with get_db() as session:
+    with _get_db() as session:
         return session.execute(sql, params).fetchall()
 
 
@@ -1000,7 +1115,7 @@ def get_entities_by_ids(
         .where(Entity.entity_id.in_(list(entity_ids)))
         .with_only_columns(Entity.entity_id, Entity.canonical_name, Entity.entity_type)
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
         return {
             r[0]: {"entity_id": r[0], "canonical_name": r[1] or "", "entity_type": r[2] or ""}
@@ -1030,7 +1145,7 @@ def get_entity_mentions_for_entities(
             EntityMention.id,
         )
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
 
     out: dict[str, list[dict[str, Any]]] = {eid: [] for eid in entity_ids}
@@ -1065,7 +1180,7 @@ def get_urls_for_section_ids(
         .join(RawPage, (Section.raw_page_id == RawPage.id) & (RawPage.tenant_id == Section.tenant_id))
         .where(tenant_where(Section, tenant_id), Section.section_id.in_(list(section_ids)))
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).fetchall()
     return {r[0]: (r[1] or r[2] or "") for r in rows}
 
@@ -1087,7 +1202,7 @@ def search_entities_text(
         .with_only_columns(Entity.entity_id, Entity.name, Entity.section_id, Entity.evidence_id)
         .limit(k)
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt).all()
         return [
             {"entity_id": r[0], "name": r[1], "section_id": r[2], "evidence_id": r[3]}
@@ -1102,16 +1217,15 @@ def search_entities(
 ) -> list[dict[str, Any]]:
     """Search entities by query (vector similarity on ec_embeddings). Returns list of {entity_id, name, type, distance}."""
     tenant_id = require_tenant_id(tenant_id)
-    from apps.api.services.embedding_provider import embed_text
+    from apps.api.services.embedding_provider import embed_text, vector_literal
 
-    emb = embed_text(query)
-    embedding_str = "[" + ",".join(str(x) for x in emb) + "]"
+    embedding_str = vector_literal(embed_text(query))
     rows = execute_ec_retrieval(tenant_id, embedding_str, k)
     entity_ids = [r[0] for r in rows]
     if not entity_ids:
         return []
     entities = {}
-    with get_db() as session:
+    with _get_db() as session:
         for e in (
             session.query(Entity.entity_id, Entity.name, Entity.entity_type)
             .filter(Entity.tenant_id == tenant_id, Entity.entity_id.in_(entity_ids))
@@ -1133,7 +1247,7 @@ def get_entity_by_id(
     """Return entity by entity_id for tenant, or None."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_entity_for_tenant(tenant_id).where(Entity.entity_id == entity_id)
-    with get_db() as session:
+    with _get_db() as session:
         row = session.scalars(stmt).first()
         if not row:
             return None
@@ -1160,7 +1274,7 @@ def create_eval_run(
 ) -> EvalRun:
     """Create an eval run. Returns the new EvalRun (id usable after session close)."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         session.expire_on_commit = False
         run = EvalRun(
             tenant_id=tenant_id,
@@ -1175,39 +1289,189 @@ def create_eval_run(
         return run
 
 
+# Above this many rows insert_eval_results_bulk hands off to copy_eval_results
+_EVAL_RESULTS_COPY_THRESHOLD = 1000
+
+
 def insert_eval_results_bulk(
     tenant_id: str | None,
     run_id: UUID,
     results: list[EvalResultCreate],
 ) -> int:
-    """Bulk insert eval results for a run. Returns count inserted."""
+    """Bulk insert eval results for a run. Returns count inserted.
+    One Core INSERT executed with a list of row dicts (batched insertmanyvalues, no ORM objects);
+    batches over _EVAL_RESULTS_COPY_THRESHOLD go through copy_eval_results."""
     tenant_id = require_tenant_id(tenant_id)
     if not results:
         return 0
-    objs = [
-        EvalResult(
+    if len(results) > _EVAL_RESULTS_COPY_THRESHOLD:
+        return copy_eval_results(tenant_id, run_id, results)
+    rows = [{"tenant_id": tenant_id, "run_id": run_id, **r.model_dump()} for r in results]
+    with _get_db() as session:
+        session.execute(insert(EvalResult), rows)
+        session.commit()
+        return len(rows)
+
+
+def create_eval_run_with_results(
+    tenant_id: str | None,
+    crawl_policy_version: str,
+    ac_version_hash: str,
+    ec_version_hash: str,
+    results: list[EvalResultCreate],
+    git_sha: str | None = None,
+) -> EvalRun:
+    """Create an eval run and insert its results in one transaction (one commit instead of two).
+    Returns the new EvalRun. For batches over _EVAL_RESULTS_COPY_THRESHOLD use create_eval_run + copy_eval_results."""
+    tenant_id = require_tenant_id(tenant_id)
+    with _get_db() as session:
+        run = EvalRun(
             tenant_id=tenant_id,
-            run_id=run_id,
-            query_id=r.query_id,
-            domain=r.domain,
-            query_text=r.query_text,
-            refused=r.refused,
-            refusal_reason=r.refusal_reason,
-            mention_ok=r.mention_ok,
-            citation_ok=r.citation_ok,
-            attribution_ok=r.attribution_ok,
-            hallucination_flag=r.hallucination_flag,
-            evidence_count=r.evidence_count,
-            avg_confidence=r.avg_confidence,
-            top_cited_urls=r.top_cited_urls,
-            answer_preview=r.answer_preview,
+            crawl_policy_version=crawl_policy_version,
+            ac_version_hash=ac_version_hash,
+            ec_version_hash=ec_version_hash,
+            git_sha=git_sha,
         )
-        for r in results
-    ]
-    with get_db() as session:
-        session.add_all(objs)
+        session.add(run)
+        session.flush()
+        if results:
+            rows = [{"tenant_id": tenant_id, "run_id": run.id, **r.model_dump()} for r in results]
+            session.execute(insert(EvalResult), rows)
         session.commit()
-        return len(objs)
+        session.refresh(run)
+        return run
+
+
+# One INSERT ... SELECT FROM unnest(arrays): a fixed 15-parameter statement regardless of batch size
+_INSERT_EVAL_RESULTS_UNNEST_SQL = text("""
+    INSERT INTO eval_result (
+        tenant_id, run_id, query_id, domain, query_text, refused, refusal_reason, mention_ok,
+        citation_ok, attribution_ok, hallucination_flag, evidence_count, avg_confidence,
+        top_cited_urls, answer_preview
+    )
+    SELECT
+        CAST(:tenant_id AS text), CAST(:run_id AS uuid), u.query_id, u.domain, u.query_text, u.refused,
+        u.refusal_reason, u.mention_ok, u.citation_ok, u.attribution_ok, u.hallucination_flag,
+        u.evidence_count, u.avg_confidence, CAST(u.top_cited_urls AS jsonb), u.answer_preview
+    FROM unnest(
+        CAST(:query_ids AS text[]), CAST(:domains AS text[]), CAST(:query_texts AS text[]),
+        CAST(:refused AS boolean[]), CAST(:refusal_reasons AS text[]), CAST(:mention_ok AS boolean[]),
+        CAST(:citation_ok AS boolean[]), CAST(:attribution_ok AS boolean[]),
+        CAST(:hallucination_flags AS boolean[]), CAST(:evidence_counts AS integer[]),
+        CAST(:avg_confidences AS double precision[]), CAST(:top_cited_urls AS text[]),
+        CAST(:answer_previews AS text[])
+    ) AS u(
+        query_id, domain, query_text, refused, refusal_reason, mention_ok, citation_ok, attribution_ok,
+        hallucination_flag, evidence_count, avg_confidence, top_cited_urls, answer_preview
+    )
+""")
+
+
+# Transaction-scoped: commit returns before the WAL is flushed (crash may lose the batch, never corrupts)
+_SYNC_COMMIT_OFF_SQL = text("SET LOCAL synchronous_commit = OFF")
+
+
+def insert_eval_results_unnest(
+    tenant_id: str | None,
+    run_id: UUID,
+    results: list[EvalResultCreate],
+    *,
+    durable: bool = True,
+) -> int:
+    """Bulk insert eval results as one INSERT ... SELECT FROM unnest(column arrays). Returns count inserted.
+    Binds one array per column, so the statement is planned once regardless of row count.
+    durable=False skips the WAL flush wait on commit (SET LOCAL synchronous_commit = OFF); for disposable seed data."""
+    tenant_id = require_tenant_id(tenant_id)
+    if not results:
+        return 0
+    params = {
+        "tenant_id": tenant_id,
+        "run_id": str(run_id),
+        "query_ids": [r.query_id for r in results],
+        "domains": [r.domain for r in results],
+        "query_texts": [r.query_text for r in results],
+        "refused": [r.refused for r in results],
+        "refusal_reasons": [r.refusal_reason for r in results],
+        "mention_ok": [r.mention_ok for r in results],
+        "citation_ok": [r.citation_ok for r in results],
+        "attribution_ok": [r.attribution_ok for r in results],
+        "hallucination_flags": [r.hallucination_flag for r in results],
+        "evidence_counts": [r.evidence_count for r in results],
+        "avg_confidences": [r.avg_confidence for r in results],
+        "top_cited_urls": [
+            json.dumps(r.top_cited_urls) if r.top_cited_urls is not None else None for r in results
+        ],
+        "answer_previews": [r.answer_preview for r in results],
+    }
+    with _get_db() as session:
+        if not durable:
+            session.execute(_SYNC_COMMIT_OFF_SQL)
+        session.execute(_INSERT_EVAL_RESULTS_UNNEST_SQL, params)
+        return len(results)
+
+
+# Column order for COPY eval_result ... FROM STDIN (copy_eval_results)
+_EVAL_RESULT_COPY_COLUMNS = (
+    "tenant_id",
+    "run_id",
+    "query_id",
+    "domain",
+    "query_text",
+    "refused",
+    "refusal_reason",
+    "mention_ok",
+    "citation_ok",
+    "attribution_ok",
+    "hallucination_flag",
+    "evidence_count",
+    "avg_confidence",
+    "top_cited_urls",
+    "answer_preview",
+)
+
+
+def copy_eval_results(
+    tenant_id: str | None,
+    run_id: UUID,
+    results: list[EvalResultCreate],
+    *,
+    durable: bool = True,
+) -> int:
+    """Bulk load eval results via COPY ... FROM STDIN in one transaction. Returns count inserted.
+    Requires the psycopg (v3) driver (postgresql+psycopg://); otherwise falls back to insert_eval_results_unnest.
+    durable=False: see insert_eval_results_unnest."""
+    tenant_id = require_tenant_id(tenant_id)
+    if not results:
+        return 0
+    copy_sql = f"COPY eval_result ({', '.join(_EVAL_RESULT_COPY_COLUMNS)}) FROM STDIN"
+    with _get_db() as session:
+        if session.get_bind().dialect.driver == "psycopg":
+            if not durable:
+                session.execute(_SYNC_COMMIT_OFF_SQL)
+            dbapi_conn = session.connection().connection.driver_connection
+            with dbapi_conn.cursor() as cur, cur.copy(copy_sql) as cp:
+                for r in results:
+                    cp.write_row(
+                        (
+                            tenant_id,
+                            run_id,
+                            r.query_id,
+                            r.domain,
+                            r.query_text,
+                            r.refused,
+                            r.refusal_reason,
+                            r.mention_ok,
+                            r.citation_ok,
+                            r.attribution_ok,
+                            r.hallucination_flag,
+                            r.evidence_count,
+                            r.avg_confidence,
+                            json.dumps(r.top_cited_urls) if r.top_cited_urls is not None else None,
+                            r.answer_preview,
+                        )
+                    )
+            return len(results)
+    return insert_eval_results_unnest(tenant_id, run_id, results, durable=durable)
 
 
 # Regex pattern for eval_domain cleanup: quote., app., secure., form. subdomains (PostgreSQL)
@@ -1220,7 +1484,7 @@ def delete_invalid_eval_domains(tenant_id: str | None) -> int:
     stmt = text(
         "DELETE FROM eval_domain WHERE tenant_id = :tenant_id AND domain ~ :pattern"
     )
-    with get_db() as session:
+    with _get_db() as session:
         result = session.execute(
             stmt,
             {"tenant_id": tenant_id, "pattern": EVAL_DOMAIN_INVALID_PREFIX_PATTERN},
@@ -1234,7 +1498,7 @@ def add_eval_domain(tenant_id: str | None, domain: str) -> bool:
     domain = (domain or "").strip()
     if not domain:
         return False
-    with get_db() as session:
+    with _get_db() as session:
         existing = session.scalars(
             select(EvalDomain).where(tenant_where(EvalDomain, tenant_id), EvalDomain.domain == domain)
         ).first()
@@ -1249,21 +1513,21 @@ def list_eval_domains(tenant_id: str | None) -> list[str]:
     """Return list of domains added for this tenant (for 24/7 eval)."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select(EvalDomain.domain).where(tenant_where(EvalDomain, tenant_id)).order_by(EvalDomain.domain)
-    with get_db() as session:
+    with _get_db() as session:
         return list(session.scalars(stmt).all())
 
 
 def list_tenant_ids() -> list[str]:
     """Return distinct tenant_id from eval_domain (for auto-eval scheduler)."""
     stmt = select(EvalDomain.tenant_id).distinct().order_by(EvalDomain.tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         return list(session.scalars(stmt).all())
 
 
 def get_scheduler_last_tick() -> datetime | None:
     """Return last_tick_at from scheduler_state (single row id=1). Used by GET /scheduler/status."""
     stmt = text("SELECT last_tick_at FROM scheduler_state WHERE id = 1")
-    with get_db() as session:
+    with _get_db() as session:
         row = session.execute(stmt).first()
     if row is None or row[0] is None:
         return None
@@ -1276,7 +1540,7 @@ def set_scheduler_last_tick() -> None:
     stmt = text(
         "UPDATE scheduler_state SET last_tick_at = now(), updated_at = now() WHERE id = 1"
     )
-    with get_db() as session:
+    with _get_db() as session:
         session.execute(stmt)
 
 
@@ -1291,7 +1555,7 @@ def delete_domain_data(tenant_id: str | None, domain: str) -> None:
     if not domain:
         raise ValueError("domain is required")
     params = {"tid": tenant_id, "domain": domain}
-    with get_db() as session:
+    with _get_db() as session:
         # Relations reference evidence; delete first
         logger.info("delete_domain_data removing relations (via evidence) tenant=%s domain=%s", tenant_id, domain)
         session.execute(
@@ -1367,7 +1631,7 @@ def get_latest_eval_run(tenant_id: str | None) -> EvalRun | None:
         .order_by(EvalRun.created_at.desc())
         .limit(1)
     )
-    with get_db() as session:
+    with _get_db() as session:
         return session.scalars(stmt).first()
 
 
@@ -1375,7 +1639,7 @@ def get_eval_run_by_id(tenant_id: str | None, run_id: UUID) -> EvalRun | None:
     """Return eval_run by id for tenant, or None."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = select_eval_run_for_tenant(tenant_id).where(EvalRun.id == run_id)
-    with get_db() as session:
+    with _get_db() as session:
         return session.scalars(stmt).first()
 
 
@@ -1395,7 +1659,7 @@ def aggregate_kpis_for_run(tenant_id: str | None, run_id: UUID) -> dict[str, Any
         .select_from(EvalResult)
         .where(tenant_where(EvalResult, tenant_id), EvalResult.run_id == run_id)
     )
-    with get_db() as session:
+    with _get_db() as session:
         row = session.execute(stmt).one_or_none()
     if not row or (row.total or 0) == 0:
         return {
@@ -1436,7 +1700,7 @@ def get_trends(
         .where(EvalRun.created_at >= cutoff)
         .order_by(EvalRun.created_at.desc())
     )
-    with get_db() as session:
+    with _get_db() as session:
         runs = list(session.scalars(stmt).all())
     points: list[dict[str, Any]] = []
     for run in runs:
@@ -1492,7 +1756,7 @@ def list_eval_results(
         EvalResult.citation_ok.asc(),
         EvalResult.evidence_count.asc(),
     ).limit(limit).offset(offset)
-    with get_db() as session:
+    with _get_db() as session:
         return list(session.scalars(stmt).all())
 
 
@@ -1503,31 +1767,24 @@ def get_eval_metrics_for_run(
     """Aggregate mention_rate, citation_rate, attribution_rate, hallucination_rate for run.
     Returns {overall: {...}, per_domain: {domain: {...}}}."""
     tenant_id = require_tenant_id(tenant_id)
-    # PostgreSQL: cast boolean to Integer (0/1) before avg; cannot cast boolean to Float directly
-    overall_stmt = (
-        select(
-            func.avg(cast(EvalResult.mention_ok, Integer)).label("mention_rate"),
-            func.avg(cast(EvalResult.citation_ok, Integer)).label("citation_rate"),
-            func.avg(cast(EvalResult.attribution_ok, Integer)).label("attribution_rate"),
-            func.avg(cast(EvalResult.hallucination_flag, Integer)).label("hallucination_rate"),
-        )
-        .select_from(EvalResult)
-        .where(tenant_where(EvalResult, tenant_id), EvalResult.run_id == run_id)
-    )
-    domain_stmt = (
+    # PostgreSQL: cast boolean to Integer (0/1) before avg; cannot cast boolean to Float directly.
+    # ROLLUP returns the per-domain groups plus the overall row (grouping(domain) = 1) in one pass.
+    stmt = (
         select(
             EvalResult.domain,
+            func.grouping(EvalResult.domain).label("is_total"),
             func.avg(cast(EvalResult.mention_ok, Integer)).label("mention_rate"),
             func.avg(cast(EvalResult.citation_ok, Integer)).label("citation_rate"),
             func.avg(cast(EvalResult.attribution_ok, Integer)).label("attribution_rate"),
             func.avg(cast(EvalResult.hallucination_flag, Integer)).label("hallucination_rate"),
         )
         .where(tenant_where(EvalResult, tenant_id), EvalResult.run_id == run_id)
-        .group_by(EvalResult.domain)
+        .group_by(func.rollup(EvalResult.domain))
     )
-    with get_db() as session:
-        overall_row = session.execute(overall_stmt).one_or_none()
-        domain_rows = session.execute(domain_stmt).all()
+    with _get_db() as session:
+        rows = session.execute(stmt).all()
+    overall_row = next((r for r in rows if r.is_total), None)
+    domain_rows = [r for r in rows if not r.is_total]
 
     def _rates(r) -> dict[str, float]:
         return {
@@ -1592,7 +1849,7 @@ def get_latest_domain_eval_snapshots(tenant_id: str | None) -> dict[str, dict[st
           ON l.domain = a.domain
         """
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt, {"tenant_id": tenant_id}).mappings().all()
 
     out: dict[str, dict[str, Any]] = {}
@@ -1658,7 +1915,7 @@ def get_domain_aggregates_from_eval_result(tenant_id: str | None) -> list[dict[s
         ORDER BY d.domain
         """
     )
-    with get_db() as session:
+    with _get_db() as session:
         rows = session.execute(stmt, {"tenant_id": tenant_id}).mappings().all()
     out: list[dict[str, Any]] = []
     for r in rows:
@@ -1693,7 +1950,7 @@ def list_eval_runs(
     if date_to is not None:
         stmt = stmt.where(func.date(EvalRun.created_at) <= date_to)
     stmt = stmt.order_by(EvalRun.created_at.desc()).limit(limit).offset(offset)
-    with get_db() as session:
+    with _get_db() as session:
         return list(session.scalars(stmt).all())
 
 
@@ -1706,11 +1963,13 @@ def get_eval_results(
     date_to: date | None = None,
     limit: int = 500,
     offset: int = 0,
-) -> list[EvalResult]:
-    """Get eval results for a run. Joins eval_run for date filters. Ordered by created_at desc."""
+) -> list[Row[Any]]:
+    """Get eval results for a run. Joins eval_run for date filters. Ordered by id desc.
+    Read-only: returns Core rows (attribute access like EvalResult, no ORM identity map)."""
     tenant_id = require_tenant_id(tenant_id)
     stmt = (
-        select_eval_result_for_tenant(tenant_id)
+        select(*EvalResult.__table__.c)
+        .where(tenant_where(EvalResult, tenant_id))
         .join(EvalRun, (EvalResult.run_id == EvalRun.id) & tenant_where(EvalRun, tenant_id))
         .where(EvalResult.run_id == run_id)
     )
@@ -1724,8 +1983,8 @@ def get_eval_results(
         stmt = stmt.where(func.date(EvalRun.created_at) <= date_to)
     # EvalResult has no created_at; order by id desc for stable ordering
     stmt = stmt.order_by(EvalResult.id.desc()).limit(limit).offset(offset)
-    with get_db() as session:
-        return list(session.scalars(stmt).all())
+    with _get_db() as session:
+        return list(session.execute(stmt).all())
 
 
 def create_monitor_event(
@@ -1736,7 +1995,7 @@ def create_monitor_event(
 ) -> MonitorEvent:
     """Create a monitor event. Returns the new MonitorEvent."""
     tenant_id = require_tenant_id(tenant_id)
-    with get_db() as session:
+    with _get_db() as session:
         evt = MonitorEvent(
             tenant_id=tenant_id,
             event_type=event_type,
@@ -1770,5 +2029,5 @@ def list_monitor_events(
     if severity is not None:
         stmt = stmt.where(MonitorEvent.severity == severity)
     stmt = stmt.order_by(MonitorEvent.created_at.desc()).limit(limit).offset(offset)
-    with get_db() as session:
+    with _get_db() as session:
         return list(session.scalars(stmt).all())
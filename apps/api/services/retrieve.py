@@ -16,7 +16,7 @@ from apps.api.schemas.responses import (
     RetrieveECResponse,
     RetrieveResponse,
 )
-from apps.api.services.embedding_provider import embed_text
+from apps.api.services.embedding_provider import embed_text, vector_literal
 from apps.api.services.rerank import rerank_sections
 from apps.api.services.repo import (
     execute_ac_retrieval,
@@ -115,7 +115,7 @@ def retrieve_ac(
 
     # Vector retrieval (top k_vec)
     query_embedding = _embed_query(query)
-    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
+    embedding_str = vector_literal(query_embedding)
     vec_rows = execute_ac_retrieval(tenant_id, embedding_str, K_VEC)
 
     vec_by_section: dict[str, float] = {}
@@ -220,7 +220,7 @@ def retrieve_ec(
     """
     tenant_id = tenant_guard(tenant_id)
     query_embedding = _embed_query(query)
-    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
+    embedding_str = vector_literal(query_embedding)
 
     rows = execute_ec_retrieval(tenant_id, embedding_str, k)
     if not rows:
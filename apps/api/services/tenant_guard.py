@@ -14,6 +14,9 @@ def require_tenant_id(tenant_id: str | None) -> str:
     Validate tenant_id; return stripped value. Raises TenantRequiredError if missing/empty.
     Call at start of every tenant-scoped repo method.
     """
+    # Fast path: an already-clean str needs no str() or strip() copy
+    if type(tenant_id) is str and tenant_id and not tenant_id[0].isspace() and not tenant_id[-1].isspace():
+        return tenant_id
     if not tenant_id or not str(tenant_id).strip():
         raise TenantRequiredError("tenant_id is required and must be non-empty")
     return str(tenant_id).strip()
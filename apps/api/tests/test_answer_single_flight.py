@@ -0,0 +1,42 @@
+"""Single-flight for /answer: concurrent cache misses on one key run the pipeline once. No DB."""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from apps.api.schemas.responses import AnswerResponse
+from apps.api.services import answer as answer_mod
+
+
+def test_concurrent_misses_on_same_key_run_pipeline_once() -> None:
+    """Two threads ask the same query while the cache is cold; _answer_impl runs once, both get the answer."""
+    calls = []
+
+    def slow_impl(query: str, tenant_id: str) -> AnswerResponse:
+        calls.append(query)
+        time.sleep(0.2)
+        return AnswerResponse(answer="once", refused=False)
+
+    results: list[AnswerResponse] = []
+    with (
+        patch.object(answer_mod, "_local_cache", OrderedDict()),
+        patch.object(answer_mod, "get_index_versions", return_value=("ac_sf", "ec_sf")),
+        patch.object(answer_mod, "get_db", side_effect=lambda: nullcontext()),
+        patch.object(answer_mod, "cache_get", return_value=None),
+        patch.object(answer_mod, "cache_set"),
+        patch.object(answer_mod, "_answer_impl", side_effect=slow_impl),
+    ):
+        threads = [
+            threading.Thread(target=lambda: results.append(answer_mod.answer("single flight q", "tenant_sf")))
+            for _ in range(2)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert len(calls) == 1
+    assert [r.answer for r in results] == ["once", "once"]
+    assert not answer_mod._inflight
@@ -1,6 +1,13 @@
 """Tests for BM25 FTS retrieval: bm25_retrieve_sections."""
 
 import pytest
+
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from sqlalchemy import text
 
 from apps.api.services.bm25 import bm25_retrieve_sections
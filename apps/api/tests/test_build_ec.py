@@ -2,6 +2,12 @@
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.index_ec import build_ec
 from apps.api.tests.conftest import requires_db
 from apps.api.services.repo import get_ec_version, get_sections_for_tenant, insert_raw_page, insert_sections
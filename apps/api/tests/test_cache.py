@@ -3,6 +3,8 @@
 import pytest
 
 from apps.api.services.cache import (
+    _dumps_payload,
+    _loads_payload,
     compute_query_hash,
     make_cache_key,
     normalize_query,
@@ -31,6 +33,18 @@ def test_compute_query_hash_hex16() -> None:
     assert compute_query_hash("hello") != compute_query_hash("world")
 
 
+def test_compute_query_hash_xxh3_when_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """HASH_ALGO=xxh3: prefixed 64-bit xxh3 hex, no colon (cache key stays 5 parts)."""
+    pytest.importorskip("xxhash")
+    monkeypatch.setenv("HASH_ALGO", "xxh3")
+    h = compute_query_hash("hello")
+    assert h.startswith("xxh3_")
+    assert len(h) == len("xxh3_") + 16
+    assert h == compute_query_hash("hello")
+    assert h != compute_query_hash("world")
+    assert len(make_cache_key("t", h, "ac", "ec", "cp").split(":")) == 5
+
+
 def test_make_cache_key_format() -> None:
     """make_cache_key produces tenant_id:query_hash:ac:ec:crawl_policy_version."""
     key = make_cache_key("t1", "abc123", "ac1", "ec1", "crawl1")
@@ -63,3 +77,33 @@ def test_full_flow_normalize_query_hash_key() -> None:
     assert "ac_v1" in key
     assert "ec_v1" in key
     assert "crawl_v1" in key
+
+
+def test_cache_payload_roundtrip_keeps_unicode() -> None:
+    """Cached payload text round-trips exactly and is not ASCII-escaped."""
+    payload = {"answer": "Café ✓", "claims": [], "citations": {}, "refused": False}
+    text = _dumps_payload(payload)
+    assert "Café ✓" in text
+    assert _loads_payload(text) == payload
+
+
+def test_local_answer_cache_lru_and_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Local answer tier evicts least recently used entries, drops expired ones and, like the
+    shared tier, treats ttl <= 0 as no expiry."""
+    from apps.api.services import answer as answer_mod
+
+    monkeypatch.setattr(answer_mod, "_local_cache", type(answer_mod._local_cache)())
+    monkeypatch.setattr(answer_mod, "_LOCAL_CACHE_MAX", 2)
+    answer_mod._local_cache_set("k1", {"answer": "1"}, None)
+    answer_mod._local_cache_set("k2", {"answer": "2"}, None)
+    assert answer_mod._local_cache_get("k1") == {"answer": "1"}
+    answer_mod._local_cache_set("k3", {"answer": "3"}, None)
+    assert answer_mod._local_cache_get("k2") is None
+    assert answer_mod._local_cache_get("k1") == {"answer": "1"}
+    answer_mod._local_cache_set("k4", {"answer": "4"}, 0)
+    assert answer_mod._local_cache_get("k4") == {"answer": "4"}
+    now = answer_mod.time.monotonic()
+    answer_mod._local_cache_set("k5", {"answer": "5"}, 5)
+    monkeypatch.setattr(answer_mod.time, "monotonic", lambda: now + 6)
+    assert answer_mod._local_cache_get("k5") is None
+    assert answer_mod._local_cache_get("k4") == {"answer": "4"}
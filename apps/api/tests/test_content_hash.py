@@ -20,3 +20,20 @@ def test_different_input_different_hash() -> None:
     h1 = content_hash("foo")
     h2 = content_hash("bar")
     assert h1 != h2
+
+
+def test_xxh3_hash_when_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """HASH_ALGO=xxh3 yields a stable 32-char hex digest that still distinguishes content."""
+    pytest.importorskip("xxhash")
+    monkeypatch.setenv("HASH_ALGO", "xxh3")
+    h1 = content_hash("Hello world")
+    assert h1 == content_hash("Hello  world")
+    assert len(h1) == 32
+    assert h1 != content_hash("Hello there")
+
+
+def test_unknown_hash_algo_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unknown HASH_ALGO fails loudly instead of silently changing hashes."""
+    monkeypatch.setenv("HASH_ALGO", "md5")
+    with pytest.raises(RuntimeError):
+        content_hash("foo")
@@ -2,6 +2,12 @@
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.repo import (
     count_raw_pages_by_crawl_policy_version,
     count_raw_pages_by_domain,
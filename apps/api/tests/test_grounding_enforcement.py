@@ -1,7 +1,8 @@
 """Tests proving hard grounding enforcement. No network; fake LLM + deterministic."""
 
 import json
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
@@ -42,13 +43,17 @@ def _mock_retrieve():
     )
 
 
+# Built once and shared: the answer service only reads the response
+_CACHED_MOCK_RETRIEVE = _mock_retrieve()
+
+
 @patch("apps.api.services.answer.insert_evidence")
 @patch("apps.api.services.answer.get_section_by_id", return_value={"text": SECTION_TEXT, "version_hash": "vh1"})
 @patch("apps.api.services.answer.retrieve_ac")
 @patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
 def test_empty_evidence_ids_refused(mock_retrieve, mock_section, mock_insert) -> None:
     """LLM returns claim with empty evidence_ids → refused, unsupported text not in response."""
-    mock_retrieve.return_value = _mock_retrieve()
+    mock_retrieve.return_value = _CACHED_MOCK_RETRIEVE
 
     def fake_llm(prompt, evidence_items):
         return json.dumps({
@@ -57,7 +62,7 @@ def test_empty_evidence_ids_refused(mock_retrieve, mock_section, mock_insert) ->
         })
 
     with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
+        mock_llm.return_value = SimpleNamespace(generate=fake_llm)
         resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
@@ -75,7 +80,7 @@ def test_empty_evidence_ids_refused(mock_retrieve, mock_section, mock_insert) ->
 @patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
 def test_nonexistent_evidence_id_refused(mock_retrieve, mock_section, mock_insert) -> None:
     """LLM returns claim with invented evidence_id → refused, unsupported text not in response."""
-    mock_retrieve.return_value = _mock_retrieve()
+    mock_retrieve.return_value = _CACHED_MOCK_RETRIEVE
 
     def fake_llm(prompt, evidence_items):
         return json.dumps({
@@ -84,7 +89,7 @@ def test_nonexistent_evidence_id_refused(mock_retrieve, mock_section, mock_inser
         })
 
     with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
+        mock_llm.return_value = SimpleNamespace(generate=fake_llm)
         resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
@@ -102,7 +107,7 @@ def test_nonexistent_evidence_id_refused(mock_retrieve, mock_section, mock_inser
 @patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false", "GROUNDING_MIN_OVERLAP": "0.3"})
 def test_low_overlap_refused(mock_retrieve, mock_section, mock_insert) -> None:
     """LLM returns claim whose text does not overlap quote_span → refused, hallucinated text not in response."""
-    mock_retrieve.return_value = _mock_retrieve()
+    mock_retrieve.return_value = _CACHED_MOCK_RETRIEVE
 
     def fake_llm(prompt, evidence_items):
         eids = [e["evidence_id"] for e in evidence_items]
@@ -114,7 +119,7 @@ def test_low_overlap_refused(mock_retrieve, mock_section, mock_insert) -> None:
         })
 
     with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
+        mock_llm.return_value = SimpleNamespace(generate=fake_llm)
         resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
@@ -132,7 +137,7 @@ def test_low_overlap_refused(mock_retrieve, mock_section, mock_insert) -> None:
 @patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
 def test_valid_claim_with_matching_quote_span_passes(mock_retrieve, mock_section, mock_insert) -> None:
     """Valid claim whose text overlaps quote_span passes and is returned."""
-    mock_retrieve.return_value = _mock_retrieve()
+    mock_retrieve.return_value = _CACHED_MOCK_RETRIEVE
 
     def fake_llm(prompt, evidence_items):
         eids = [e["evidence_id"] for e in evidence_items]
@@ -144,7 +149,7 @@ def test_valid_claim_with_matching_quote_span_passes(mock_retrieve, mock_section
         })
 
     with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
+        mock_llm.return_value = SimpleNamespace(generate=fake_llm)
         resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
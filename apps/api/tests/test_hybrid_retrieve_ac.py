@@ -6,6 +6,13 @@ Uses deterministic embedding provider (ENV=test in conftest) - no network.
 import os
 
 import pytest
+
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from fastapi.testclient import TestClient
 
 from apps.api.main import app
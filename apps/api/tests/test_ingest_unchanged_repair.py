@@ -4,6 +4,12 @@ from unittest.mock import patch
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.pipeline import run_day1_pipeline
 from apps.api.services.repo import (
     delete_ac_embeddings_for_section_ids,
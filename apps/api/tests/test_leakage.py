@@ -2,6 +2,12 @@
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.grounding import create_evidence_for_sections
 from apps.api.services.index_ac import index_ac
 from apps.api.services.repo import (
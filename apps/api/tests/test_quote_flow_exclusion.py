@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 import pytest
 
+from apps.api.services.crawl_report import iter_jsonl
 from apps.api.services.crawl_rules import classify_url, is_url_allowed
 from apps.api.services.pipeline import run_day1_pipeline
 from apps.api.services.repo import get_table_counts_for_tenant
@@ -47,6 +48,36 @@ def test_classify_url_returns_page_type_and_reason() -> None:
         assert reason and len(reason) > 0
 
 
+_JSONL_WITH_BAD_LINES = (
+    '{"decision": "allowed"}\n\nnot-json\n[1, 2]\n42\n"text"\n{"decision": "excluded", "reason": "r"}\n'
+)
+
+
+def test_iter_jsonl_streams_records_and_skips_bad_lines() -> None:
+    """iter_jsonl yields parsed records, skipping blank, malformed and non-object lines; missing file yields nothing."""
+    tmpdir = tempfile.mkdtemp()
+    report_path = Path(tmpdir) / "crawl_report.jsonl"
+    report_path.write_text(_JSONL_WITH_BAD_LINES, encoding="utf-8")
+    records = list(iter_jsonl(report_path))
+    assert [r["decision"] for r in records] == ["allowed", "excluded"]
+    assert list(iter_jsonl(Path(tmpdir) / "missing.jsonl")) == []
+
+
+def test_iter_jsonl_msgspec_and_json_paths_agree(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """With msgspec installed, the stdlib json fallback yields exactly the same records."""
+    pytest.importorskip("msgspec")
+    from apps.api.services import crawl_report
+
+    assert crawl_report.MSGSPEC_AVAILABLE
+    report_path = tmp_path / "crawl_report.jsonl"
+    report_path.write_text(_JSONL_WITH_BAD_LINES, encoding="utf-8")
+    via_msgspec = list(iter_jsonl(report_path))
+    monkeypatch.setattr(crawl_report, "_decode_line", json.loads)
+    monkeypatch.setattr(crawl_report, "_DECODE_ERRORS", (ValueError,))
+    assert list(iter_jsonl(report_path)) == via_msgspec
+    assert [r["decision"] for r in via_msgspec] == ["allowed", "excluded"]
+
+
 @requires_db
 def test_pipeline_does_not_write_raw_page_or_sections_for_excluded() -> None:
     """Pipeline excludes URLs and does not insert sections (excluded pages may be stored for audit)."""
@@ -5,6 +5,12 @@ from datetime import datetime, timezone
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.ingest import ingest_page
 from apps.api.services.normalize import content_hash
 from apps.api.services.repo import get_sections_by_raw_page_id
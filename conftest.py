@@ -15,7 +15,8 @@ DATABASE_TEST_URL = os.getenv("DATABASE_TEST_URL")
 from tests._db_bootstrap import (
     ensure_test_db_guard,
     postgres_reachable,
-    run_test_db_schema_fixture,
+    run_test_db_schema_once,
+    warm_embedding_provider,
 )
 
 # Run guard at conftest load; fails early if wrong DB (when test URL is set)
@@ -31,11 +32,18 @@ def _db_available_for_schema() -> bool:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def test_db_schema():
+def test_db_schema(tmp_path_factory):
     """Reset test DB schema at session start. Only runs if DATABASE_TEST_URL is set and reachable.
     Drops schema public CASCADE, recreates it, applies schema via SCHEMA_AUTHORITY.
     Safety: db name must contain '_test' or ALLOW_TEST_DB_RESET=true.
     DB tests are skipped via @pytest.mark.requires_db when not configured."""
     if not _db_available_for_schema():
         return
-    run_test_db_schema_fixture()
+    # Once per run: under xdist only the first worker resets; the rest wait (basetemp parent is shared)
+    run_test_db_schema_once(tmp_path_factory.getbasetemp().parent)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _embedding_provider():
+    """Build the (deterministic) embedding provider once per session, DB or not; tests reuse it."""
+    warm_embedding_provider()
@@ -194,7 +194,7 @@ def _rec_to_eval_result_create(rec: dict[str, Any]) -> dict[str, Any] | None:
     }
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Eval harness: call /answer for each query, save results.")
     parser.add_argument("--dataset", default="eval/queries_seed.jsonl", help="Input JSONL dataset path")
     parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
@@ -207,7 +207,7 @@ def main() -> int:
     parser.add_argument("--ac-version-hash", default="harness", help="Eval run metadata (default: harness)")
     parser.add_argument("--ec-version-hash", default="harness", help="Eval run metadata (default: harness)")
     parser.add_argument("--git-sha", help="Optional git SHA for eval run")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.write_db and not (args.tenant or "").strip():
         print("Error: --tenant is required when --write-db", file=sys.stderr)
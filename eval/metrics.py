@@ -9,10 +9,28 @@ from pathlib import Path
 # Ensure project root on path when run as script
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from collections.abc import Iterable
 from typing import Any
 
 from eval.normalize import normalize_answer_response
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _loads(line: str | bytes) -> Any:
+    """Parse one JSONL line; orjson when installed. orjson rejects the NaN/Infinity tokens that
+    json.dumps writes by default, so such lines are retried with json.loads (same records either way)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
 
 # Composite Visibility Index weights
 WEIGHT_ANSWER_RATE = 0.30
@@ -24,42 +42,51 @@ WEIGHT_HALLUCINATION_PENALTY = 0.10
 WORST_TOP_N = 10
 
 
-def _load_results(path: Path) -> list[dict[str, Any]]:
-    """Load results.jsonl and normalize each record."""
+def _load_results(source: Path | str | Iterable[str | bytes]) -> list[dict[str, Any]]:
+    """Load results.jsonl and normalize each record.
+    source: a path, or an already-open text stream / iterable of lines (e.g. io.StringIO)."""
+    if isinstance(source, (str, Path)):
+        # Bytes lines go straight to orjson (no decode pass); json.loads accepts UTF-8 bytes too
+        with open(source, "rb") as f:
+            return _parse_results(f)
+    return _parse_results(source)
+
+
+def _parse_results(lines: Iterable[str | bytes]) -> list[dict[str, Any]]:
+    """Parse JSONL lines into normalized records. Blank, malformed and error rows are skipped."""
     records: list[dict[str, Any]] = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                raw = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            # Skip rows with request-level error (no response)
-            if raw.get("error"):
-                continue
-            resp = {
-                "refused": raw.get("refused"),
-                "refusal_reason": raw.get("refusal_reason"),
-                "answer": raw.get("answer"),
-                "claims": raw.get("claims"),
-                "citations": raw.get("citations"),
-                "evidence_ids": raw.get("evidence_ids"),
-                "scores": raw.get("scores"),
-                "debug": raw.get("debug"),
-            }
-            norm = normalize_answer_response(resp)
-            record = {
-                "query_id": raw.get("query_id"),
-                "tenant_id": raw.get("tenant_id"),
-                "domain": raw.get("domain"),
-                "query": raw.get("query"),
-                "notes": raw.get("notes"),
-                **norm,
-                "latency_ms": raw.get("latency_ms"),
-            }
-            records.append(record)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = _loads(line)
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+            continue
+        # Skip rows with request-level error (no response)
+        if raw.get("error"):
+            continue
+        resp = {
+            "refused": raw.get("refused"),
+            "refusal_reason": raw.get("refusal_reason"),
+            "answer": raw.get("answer"),
+            "claims": raw.get("claims"),
+            "citations": raw.get("citations"),
+            "evidence_ids": raw.get("evidence_ids"),
+            "scores": raw.get("scores"),
+            "debug": raw.get("debug"),
+        }
+        norm = normalize_answer_response(resp)
+        record = {
+            "query_id": raw.get("query_id"),
+            "tenant_id": raw.get("tenant_id"),
+            "domain": raw.get("domain"),
+            "query": raw.get("query"),
+            "notes": raw.get("notes"),
+            **norm,
+            "latency_ms": raw.get("latency_ms"),
+        }
+        records.append(record)
     return records
 
 
@@ -2,6 +2,9 @@
 
 from typing import Any
 
+# debug fields surfaced as scores, in output order
+_SCORE_KEYS = ("threshold", "top_score")
+
 
 def normalize_answer_response(resp_json: dict[str, Any] | None) -> dict[str, Any]:
     """
@@ -11,47 +14,40 @@ def normalize_answer_response(resp_json: dict[str, Any] | None) -> dict[str, Any
     """
     if resp_json is None:
         return _default_output()
+    get = resp_json.get
 
-    refused = _safe_bool(resp_json.get("refused"), False)
-    refusal_reason = resp_json.get("refusal_reason")
-    if refused and refusal_reason is None:
-        refusal_reason = None  # present but unknown; do not fabricate
+    refused = _safe_bool(get("refused"), False)
+    # refusal_reason passes through as-is (None when unknown); never fabricated
+    refusal_reason = get("refusal_reason")
 
-    answer = resp_json.get("answer")
+    answer = get("answer")
     if answer is None:
         answer = ""
 
-    claims = resp_json.get("claims")
+    claims = get("claims")
     if not isinstance(claims, list):
         claims = []
 
-    citations = resp_json.get("citations")
-    if citations is None:
-        citations = {}
-    elif not isinstance(citations, dict):
+    citations = get("citations")
+    if not isinstance(citations, dict):
         citations = {}
 
-    evidence_ids: list[str] = []
-    for c in claims:
-        if isinstance(c, dict):
-            eids = c.get("evidence_ids")
-            if isinstance(eids, list):
-                evidence_ids.extend(e for e in eids if isinstance(e, str))
-    evidence_ids = list(dict.fromkeys(evidence_ids))
+    # Ordered de-dup of string evidence_ids across claims, in one pass
+    evidence_ids = list(
+        dict.fromkeys(
+            e
+            for c in claims
+            if isinstance(c, dict) and isinstance(eids := c.get("evidence_ids"), list)
+            for e in eids
+            if isinstance(e, str)
+        )
+    )
 
-    debug = resp_json.get("debug")
+    debug = get("debug")
     scores: dict[str, float] | None = None
     if isinstance(debug, dict):
-        scores = {}
-        t = debug.get("threshold")
-        if t is not None and isinstance(t, (int, float)):
-            scores["threshold"] = float(t)
-        s = debug.get("top_score")
-        if s is not None and isinstance(s, (int, float)):
-            scores["top_score"] = float(s)
-        if not scores:
-            scores = None
-    elif debug is not None and not isinstance(debug, dict):
+        scores = {k: float(v) for k in _SCORE_KEYS if isinstance(v := debug.get(k), (int, float))} or None
+    elif debug is not None:
         debug = None
 
     return {
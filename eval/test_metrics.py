@@ -13,133 +13,142 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from eval.metrics import _compute_metrics, _load_results, _worst_queries, _sorted_json
 
 
-def test_compute_metrics_empty() -> None:
-    m = _compute_metrics([])
-    assert m["total_queries"] == 0
-    assert m["mention_answer_rate"] == 0.0
-    assert m["citation_rate"] == 0.0
-    assert m["attribution_accuracy_proxy"] == 0.0
-    assert m["hallucination_incidents"] == 0
-    assert m["composite_visibility_index"] == 0.0
-
-
-def test_compute_metrics_all_refused() -> None:
-    records = [
-        {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
-        {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
-    ]
-    m = _compute_metrics(records)
-    assert m["total_queries"] == 2
-    assert m["refused_count"] == 2
-    assert m["answered_count"] == 0
-    assert m["mention_answer_rate"] == 0.0
-    assert m["citation_rate"] == 0.0
-    assert m["hallucination_incidents"] == 0
-
-
-def test_compute_metrics_mention_answer_rate() -> None:
-    records = [
-        {"refused": False, "answer": "Yes", "claims": [], "citations": {}, "evidence_ids": []},
-        {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
-    ]
-    m = _compute_metrics(records)
-    assert m["mention_answer_rate"] == 0.5
-    assert m["answered_count"] == 1
-    assert m["refused_count"] == 1
-
-
-def test_compute_metrics_citation_rate() -> None:
-    records = [
-        {"refused": False, "answer": "A", "claims": [], "citations": {"e1": {}}, "evidence_ids": []},
-        {"refused": False, "answer": "B", "claims": [], "citations": {}, "evidence_ids": []},
-    ]
-    m = _compute_metrics(records)
-    assert m["citation_rate"] == 0.5
-    assert m["answered_with_citations_count"] == 1
-
-
-def test_compute_metrics_attribution_accuracy() -> None:
-    records = [
+_ANSWERED_SUPPORTED = {
+    "refused": False,
+    "answer": "A",
+    "claims": [{"text": "X", "evidence_ids": ["e1"], "confidence": 0.9}],
+    "citations": {"e1": {}},
+    "evidence_ids": ["e1"],
+}
+
+# (id, records, expected subset of metrics)
+COMPUTE_METRICS_CASES = [
+    (
+        "empty",
+        [],
         {
-            "refused": False,
-            "answer": "A",
-            "claims": [
-                {"text": "X", "evidence_ids": ["e1"], "confidence": 0.9},
-                {"text": "Y", "evidence_ids": ["e2"], "confidence": 0.8},
-            ],
-            "citations": {"e1": {}, "e2": {}},
-            "evidence_ids": ["e1", "e2"],
+            "total_queries": 0,
+            "mention_answer_rate": 0.0,
+            "citation_rate": 0.0,
+            "attribution_accuracy_proxy": 0.0,
+            "hallucination_incidents": 0,
+            "composite_visibility_index": 0.0,
         },
-    ]
-    m = _compute_metrics(records)
-    assert m["total_claims"] == 2
-    assert m["supported_claims"] == 2
-    assert m["attribution_accuracy_proxy"] == 1.0
-
-
-def test_compute_metrics_attribution_partial() -> None:
-    records = [
+    ),
+    (
+        "all_refused",
+        [
+            {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
+            {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
+        ],
         {
-            "refused": False,
-            "answer": "A",
-            "claims": [
-                {"text": "X", "evidence_ids": ["e1"], "confidence": 0.9},
-                {"text": "Y", "evidence_ids": ["e2"], "confidence": 0.8},
-            ],
-            "citations": {"e1": {}},
-            "evidence_ids": ["e1", "e2"],
+            "total_queries": 2,
+            "refused_count": 2,
+            "answered_count": 0,
+            "mention_answer_rate": 0.0,
+            "citation_rate": 0.0,
+            "hallucination_incidents": 0,
         },
-    ]
-    m = _compute_metrics(records)
-    assert m["total_claims"] == 2
-    assert m["supported_claims"] == 1
-    assert m["attribution_accuracy_proxy"] == 0.5
-
-
-def test_compute_metrics_hallucination_empty_evidence_ids() -> None:
-    records = [
+    ),
+    (
+        "mention_answer_rate",
+        [
+            {"refused": False, "answer": "Yes", "claims": [], "citations": {}, "evidence_ids": []},
+            {"refused": True, "answer": "", "claims": [], "citations": {}, "evidence_ids": []},
+        ],
+        {"mention_answer_rate": 0.5, "answered_count": 1, "refused_count": 1},
+    ),
+    (
+        "citation_rate",
+        [
+            {"refused": False, "answer": "A", "claims": [], "citations": {"e1": {}}, "evidence_ids": []},
+            {"refused": False, "answer": "B", "claims": [], "citations": {}, "evidence_ids": []},
+        ],
+        {"citation_rate": 0.5, "answered_with_citations_count": 1},
+    ),
+    (
+        "attribution_accuracy",
+        [
+            {
+                "refused": False,
+                "answer": "A",
+                "claims": [
+                    {"text": "X", "evidence_ids": ["e1"], "confidence": 0.9},
+                    {"text": "Y", "evidence_ids": ["e2"], "confidence": 0.8},
+                ],
+                "citations": {"e1": {}, "e2": {}},
+                "evidence_ids": ["e1", "e2"],
+            },
+        ],
+        {"total_claims": 2, "supported_claims": 2, "attribution_accuracy_proxy": 1.0},
+    ),
+    (
+        "attribution_partial",
+        [
+            {
+                "refused": False,
+                "answer": "A",
+                "claims": [
+                    {"text": "X", "evidence_ids": ["e1"], "confidence": 0.9},
+                    {"text": "Y", "evidence_ids": ["e2"], "confidence": 0.8},
+                ],
+                "citations": {"e1": {}},
+                "evidence_ids": ["e1", "e2"],
+            },
+        ],
+        {"total_claims": 2, "supported_claims": 1, "attribution_accuracy_proxy": 0.5},
+    ),
+    (
+        "hallucination_empty_evidence_ids",
+        [
+            {
+                "refused": False,
+                "answer": "A",
+                "claims": [{"text": "X", "evidence_ids": [], "confidence": 0.9}],
+                "citations": {},
+                "evidence_ids": [],
+            },
+        ],
+        {"hallucination_incidents": 1, "hallucination_rate": 1.0},
+    ),
+    (
+        "hallucination_missing_citation",
+        [
+            {
+                "refused": False,
+                "answer": "A",
+                "claims": [{"text": "X", "evidence_ids": ["e1"], "confidence": 0.9}],
+                "citations": {},
+                "evidence_ids": ["e1"],
+            },
+        ],
+        {"hallucination_incidents": 1},
+    ),
+    (
+        "composite_visibility",
+        [_ANSWERED_SUPPORTED] * 2,
         {
-            "refused": False,
-            "answer": "A",
-            "claims": [{"text": "X", "evidence_ids": [], "confidence": 0.9}],
-            "citations": {},
-            "evidence_ids": [],
+            "mention_answer_rate": 1.0,
+            "citation_rate": 1.0,
+            "attribution_accuracy_proxy": 1.0,
+            "hallucination_incidents": 0,
         },
-    ]
-    m = _compute_metrics(records)
-    assert m["hallucination_incidents"] == 1
-    assert m["hallucination_rate"] == 1.0
+    ),
+]
 
 
-def test_compute_metrics_hallucination_missing_citation() -> None:
-    records = [
-        {
-            "refused": False,
-            "answer": "A",
-            "claims": [{"text": "X", "evidence_ids": ["e1"], "confidence": 0.9}],
-            "citations": {},
-            "evidence_ids": ["e1"],
-        },
-    ]
+@pytest.mark.parametrize(
+    "records,expected",
+    [pytest.param(records, expected, id=name) for name, records, expected in COMPUTE_METRICS_CASES],
+)
+def test_compute_metrics(records: list, expected: dict) -> None:
     m = _compute_metrics(records)
-    assert m["hallucination_incidents"] == 1
+    for key, value in expected.items():
+        assert m[key] == value, key
 
 
-def test_compute_metrics_composite_visibility() -> None:
-    records = [
-        {
-            "refused": False,
-            "answer": "A",
-            "claims": [{"text": "X", "evidence_ids": ["e1"], "confidence": 0.9}],
-            "citations": {"e1": {}},
-            "evidence_ids": ["e1"],
-        },
-    ] * 2
-    m = _compute_metrics(records)
-    assert m["mention_answer_rate"] == 1.0
-    assert m["citation_rate"] == 1.0
-    assert m["attribution_accuracy_proxy"] == 1.0
-    assert m["hallucination_incidents"] == 0
+def test_compute_metrics_composite_visibility_index_high() -> None:
+    m = _compute_metrics([_ANSWERED_SUPPORTED] * 2)
     assert m["composite_visibility_index"] >= 90
 
 
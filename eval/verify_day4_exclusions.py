@@ -10,17 +10,16 @@ Requires: Postgres running, policy with allowed_domains including both domains
 Run: python eval/verify_day4_exclusions.py
 """
 
-import json
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from apps.api.db import ensure_tables
-from apps.api.services.crawl_report import DEFAULT_REPORT_PATH
+from apps.api.services.crawl_report import DEFAULT_REPORT_PATH, iter_jsonl
 from apps.api.services.exclusion import PAGE_TYPE_EXCLUDED
 from apps.api.services.pipeline import run_day1_pipeline
-from apps.api.services.repo import get_raw_page_counts_by_domain_page_type
+from apps.api.services.repo import get_raw_page_counts_by_page_type
 
 TENANT_ID = "coast2coast"
 
@@ -32,19 +31,15 @@ URL_EXCLUDED = "https://quote.unitedglobalvanline.com/get-quote"
 
 
 def _counts_by_page_type(tenant_id: str) -> dict[str, int]:
-    """Aggregate raw_page counts by page_type for tenant."""
-    rows = get_raw_page_counts_by_domain_page_type(tenant_id)
-    out: dict[str, int] = {}
-    for _domain, page_type, count in rows:
-        out[page_type] = out.get(page_type, 0) + count
-    return out
+    """Raw_page counts by page_type for tenant (aggregated in SQL)."""
+    return get_raw_page_counts_by_page_type(tenant_id)
 
 
 def main() -> None:
     ensure_tables()
 
+    # Report dir is created on first append; iter_jsonl tolerates a missing file.
     report_path = DEFAULT_REPORT_PATH
-    report_path.parent.mkdir(parents=True, exist_ok=True)
 
     print("=== Day 4 Exclusion Proof ===\n")
     print(f"Tenant: {TENANT_ID}\n")
@@ -84,15 +79,18 @@ def main() -> None:
         ok = False
 
     # 2) Crawl report includes excluded record with reason
-    report_records = []
-    if report_path.exists():
-        with open(report_path, encoding="utf-8") as f:
-            report_records = [json.loads(line) for line in f]
-    excluded_record = next((r for r in report_records if r.get("decision") == "excluded" and r.get("reason")), None)
-    if excluded_record and excluded_record.get("reason"):
+    # Stream the report and stop at the first match; never hold the whole file in memory.
+    excluded_record = None
+    total_records = 0
+    for r in iter_jsonl(report_path):
+        total_records += 1
+        if r.get("decision") == "excluded" and r.get("reason"):
+            excluded_record = r
+            break
+    if excluded_record:
         print(f"[OK] Crawl report includes excluded record with reason={excluded_record['reason'][:60]}...")
     else:
-        print(f"[FAIL] Crawl report missing excluded record with reason. Total records: {len(report_records)}")
+        print(f"[FAIL] Crawl report missing excluded record with reason. Total records: {total_records}")
         ok = False
 
     # 3) Excluded raw_page row exists
@@ -17,6 +17,7 @@ from unittest.mock import patch
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from apps.api.db import ensure_tables
+from apps.api.services import pipeline
 from apps.api.services.pipeline import run_day1_pipeline
 from apps.api.services.repo import get_latest_raw_page_by_canonical_url, get_table_counts_for_tenant
 from apps.api.services.url_utils import canonicalize_url
@@ -57,70 +58,68 @@ def main() -> None:
     counts = get_table_counts_for_tenant(TENANT_ID)
     count_before = counts["raw_page"]
 
-    # 1) Run pipeline twice with same content (monkeypatch fetch)
-    fetch_same = _make_fetch_result(HTML_SAME)
-    with patch("apps.api.services.pipeline._fetch", return_value=fetch_same):
+    # Monkeypatch fetch once for all three runs: same, same, modified (consumed in order)
+    responses = iter([_make_fetch_result(HTML_SAME), _make_fetch_result(HTML_SAME), _make_fetch_result(HTML_MODIFIED)])
+    with patch.object(pipeline, "_fetch", side_effect=lambda *a, **k: next(responses)):
+        # 1) Run pipeline twice with same content
         r1 = run_day1_pipeline(TENANT_ID, URL)
-    raw_page_id_1 = r1.get("raw_page_id")
-    changed_1 = not r1.get("unchanged", False)
+        raw_page_id_1 = r1.get("raw_page_id")
+        changed_1 = not r1.get("unchanged", False)
 
-    with patch("apps.api.services.pipeline._fetch", return_value=fetch_same):
         r2 = run_day1_pipeline(TENANT_ID, URL)
-    raw_page_id_2 = r2.get("raw_page_id")
-    changed_2 = not r2.get("unchanged", False)
-
-    count_after_same = get_table_counts_for_tenant(TENANT_ID)["raw_page"]
-    latest = get_latest_raw_page_by_canonical_url(TENANT_ID, URL)
-
-    print("Run 1 (same):")
-    print(f"  raw_page_id={raw_page_id_1} version={latest['version']} content_hash={latest['content_hash'][:8] if latest and latest.get('content_hash') else '-'} changed={changed_1}")
-    print("Run 2 (same content):")
-    print(f"  raw_page_id={raw_page_id_2} version={latest['version']} content_hash={latest['content_hash'][:8] if latest and latest.get('content_hash') else '-'} changed={changed_2}")
-
-    # Assert: no new row, same raw_page_id
-    ok = True
-    if count_after_same == count_before + 1:  # Only 1 new row from run 1; run 2 added none
-        print("\n[OK] Same content twice: raw_page count increased by 1 (run 1 only)")
-    else:
-        print(f"\n[FAIL] Same content twice: expected count {count_before}+1={count_before+1}, got {count_after_same}")
-        ok = False
-
-    if raw_page_id_1 == raw_page_id_2:
-        print("[OK] Same content: raw_page_id unchanged")
-    else:
-        print(f"[FAIL] Same content: raw_page_id should match, got {raw_page_id_1} vs {raw_page_id_2}")
-        ok = False
-
-    # 2) Run pipeline with modified content
-    version_before = latest["version"] if latest else 0
-    fetch_modified = _make_fetch_result(HTML_MODIFIED)
-    with patch("apps.api.services.pipeline._fetch", return_value=fetch_modified):
+        raw_page_id_2 = r2.get("raw_page_id")
+        changed_2 = not r2.get("unchanged", False)
+
+        count_after_same = get_table_counts_for_tenant(TENANT_ID)["raw_page"]
+        latest = get_latest_raw_page_by_canonical_url(TENANT_ID, URL)
+
+        print("Run 1 (same):")
+        print(f"  raw_page_id={raw_page_id_1} version={latest['version']} content_hash={latest['content_hash'][:8] if latest and latest.get('content_hash') else '-'} changed={changed_1}")
+        print("Run 2 (same content):")
+        print(f"  raw_page_id={raw_page_id_2} version={latest['version']} content_hash={latest['content_hash'][:8] if latest and latest.get('content_hash') else '-'} changed={changed_2}")
+
+        # Assert: no new row, same raw_page_id
+        ok = True
+        if count_after_same == count_before + 1:  # Only 1 new row from run 1; run 2 added none
+            print("\n[OK] Same content twice: raw_page count increased by 1 (run 1 only)")
+        else:
+            print(f"\n[FAIL] Same content twice: expected count {count_before}+1={count_before+1}, got {count_after_same}")
+            ok = False
+
+        if raw_page_id_1 == raw_page_id_2:
+            print("[OK] Same content: raw_page_id unchanged")
+        else:
+            print(f"[FAIL] Same content: raw_page_id should match, got {raw_page_id_1} vs {raw_page_id_2}")
+            ok = False
+
+        # 2) Run pipeline with modified content
+        version_before = latest["version"] if latest else 0
         r3 = run_day1_pipeline(TENANT_ID, URL)
-    raw_page_id_3 = r3.get("raw_page_id")
-    changed_3 = not r3.get("unchanged", False)
-    latest2 = get_latest_raw_page_by_canonical_url(TENANT_ID, URL)
-    count_after_modified = get_table_counts_for_tenant(TENANT_ID)["raw_page"]
-
-    print("\nRun 3 (modified content):")
-    print(f"  raw_page_id={raw_page_id_3} version={latest2['version']} content_hash={latest2['content_hash'][:8] if latest2 and latest2.get('content_hash') else '-'} changed={changed_3}")
-
-    if count_after_modified == count_after_same + 1:
-        print("[OK] Modified content: raw_page count increased by 1")
-    else:
-        print(f"[FAIL] Modified content: expected count {count_after_same}+1, got {count_after_modified}")
-        ok = False
-
-    if latest2 and latest2["version"] == version_before + 1:
-        print(f"[OK] Modified content: version incremented {version_before} -> {latest2['version']}")
-    else:
-        print(f"[FAIL] Modified content: version should be {version_before}+1, got {latest2['version'] if latest2 else 'None'}")
-        ok = False
-
-    if raw_page_id_3 != raw_page_id_1:
-        print("[OK] Modified content: new raw_page_id (new row)")
-    else:
-        print(f"[FAIL] Modified content: raw_page_id should differ from run 1")
-        ok = False
+        raw_page_id_3 = r3.get("raw_page_id")
+        changed_3 = not r3.get("unchanged", False)
+        latest2 = get_latest_raw_page_by_canonical_url(TENANT_ID, URL)
+        count_after_modified = get_table_counts_for_tenant(TENANT_ID)["raw_page"]
+
+        print("\nRun 3 (modified content):")
+        print(f"  raw_page_id={raw_page_id_3} version={latest2['version']} content_hash={latest2['content_hash'][:8] if latest2 and latest2.get('content_hash') else '-'} changed={changed_3}")
+
+        if count_after_modified == count_after_same + 1:
+            print("[OK] Modified content: raw_page count increased by 1")
+        else:
+            print(f"[FAIL] Modified content: expected count {count_after_same}+1, got {count_after_modified}")
+            ok = False
+
+        if latest2 and latest2["version"] == version_before + 1:
+            print(f"[OK] Modified content: version incremented {version_before} -> {latest2['version']}")
+        else:
+            print(f"[FAIL] Modified content: version should be {version_before}+1, got {latest2['version'] if latest2 else 'None'}")
+            ok = False
+
+        if raw_page_id_3 != raw_page_id_1:
+            print("[OK] Modified content: new raw_page_id (new row)")
+        else:
+            print(f"[FAIL] Modified content: raw_page_id should differ from run 1")
+            ok = False
 
     if not ok:
         sys.exit(1)
@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 """Smoke test for production shape. Verifies /health, /metrics/latest, eval_run, leakage monitor_event.
 
+Eval (steps 2-4) and leakage (steps 5-6) run concurrently after /health.
+
 Run with: make smoke (or python scripts/smoke_prod.py)
 Requires: API running. Start API with EMBED_PROVIDER=deterministic (or ENV=test) to avoid HuggingFace.
 """
 
+import atexit
+import io
 import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Project root
 ROOT = Path(__file__).resolve().parent.parent
@@ -19,61 +28,156 @@ sys.path.insert(0, str(ROOT))
 API_BASE = os.getenv("API_BASE", "http://localhost:8000").rstrip("/")
 TENANT = "smoke_smoke"
 AUTH_HEADER = f"Bearer tenant:{TENANT}"
+# Wall-clock budget per chain (covers the in-process and subprocess paths alike)
+CHAIN_TIMEOUTS = {"eval": 120.0, "leakage": 60.0}
+
+
+# Env passed to fallback subprocesses: interpreter/venv basics plus what harness/leakage and the
+# apps.api/cron modules they import read (keep in sync when those grow new env knobs)
+_MIN_ENV_KEYS = (
+    "PATH",
+    "HOME",
+    "VIRTUAL_ENV",
+    "PYTHONPATH",
+    "ENV",
+    "ENVIRONMENT",
+    "DATABASE_URL",
+    "SQL_ECHO",
+    "EMBED_PROVIDER",
+    "HASH_ALGO",
+    "FTS_LANG",
+    "GIT_SHA",
+    "EVAL_BEARER_TOKEN",
+    "EVAL_API_KEY",
+    "LOOKBACK_RUNS",
+    "REFUSAL_SPIKE_ABS",
+    "CITATION_DROP_ABS",
+    "EVENT_COOLDOWN_HOURS",
+)
+
+
+def _subprocess_env(**overrides: str) -> dict[str, str]:
+    env = {k: os.environ[k] for k in _MIN_ENV_KEYS if k in os.environ}
+    env.update(overrides)
+    return env
+
+
+# One keep-alive session for every call (no per-request TCP/TLS handshake)
+SESSION = requests.Session()
+SESSION.headers.update({"Authorization": AUTH_HEADER})
+SESSION.mount(API_BASE, HTTPAdapter(pool_connections=1, pool_maxsize=4))
+atexit.register(SESSION.close)
 
 
 def _get(path: str) -> requests.Response:
-    return requests.get(f"{API_BASE}{path}", headers={"Authorization": AUTH_HEADER}, timeout=30)
+    return SESSION.get(f"{API_BASE}{path}", timeout=30)
 
 
 def _ok(resp: requests.Response) -> bool:
     return resp.status_code == 200
 
 
-def main() -> int:
-    failures: list[str] = []
+class _ThreadStderrTee(io.TextIOBase):
+    """Pass stderr writes through, keeping a per-thread copy for threads that asked for one.
+    Installed once as sys.stderr before both chains start, so neither worker rebinds the global;
+    the concurrent leakage chain's output never lands in the eval chain's copy."""
 
-    # 1. GET /health => ok true
-    print("1. GET /health ...")
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._buffers: dict[int, io.StringIO] = {}
+
+    def start_capture(self) -> None:
+        self._buffers[threading.get_ident()] = io.StringIO()
+
+    def stop_capture(self) -> str:
+        buf = self._buffers.pop(threading.get_ident(), None)
+        return buf.getvalue() if buf is not None else ""
+
+    def write(self, s: str) -> int:
+        buf = self._buffers.get(threading.get_ident())
+        if buf is not None:
+            buf.write(s)
+        return self._stream.write(s)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _run_harness(argv: list[str]) -> tuple[int, str]:
+    """Run eval.harness in-process (no second interpreter start). Returns (exit code, stderr text).
+    Falls back to a subprocess if the harness cannot be imported here."""
     try:
-        r = requests.get(f"{API_BASE}/health", timeout=10)
-        if not _ok(r):
-            failures.append(f"/health => {r.status_code}")
-        else:
-            data = r.json()
-            if not data.get("ok"):
-                failures.append("/health => ok not True")
-            else:
-                print("   ok")
-    except Exception as e:
-        failures.append(f"/health => {e}")
-        print(f"   FAIL: {e}")
-        return 1
+        from eval.harness import main as harness_main
+    except ImportError:
+        result = subprocess.run(
+            [sys.executable, "-m", "eval.harness", *argv],
+            cwd=str(ROOT),
+            env=_subprocess_env(),
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        return result.returncode, result.stderr
+    # The harness reports errors on stderr; keep this thread's output for the failure message
+    tee = sys.stderr if isinstance(sys.stderr, _ThreadStderrTee) else None
+    if tee is not None:
+        tee.start_capture()
+    try:
+        rc = harness_main(argv)
+    except SystemExit as e:  # argparse errors
+        rc = e.code if isinstance(e.code, int) else 1
+    finally:
+        err = tee.stop_capture() if tee is not None else ""
+    return rc, err
+
+
+def _run_leakage() -> int:
+    """Run cron.leakage_nightly for TENANT against API_BASE in-process; subprocess if it cannot be imported."""
+    try:
+        from cron import leakage_nightly
+    except ImportError:
+        result = subprocess.run(
+            [sys.executable, "-m", "cron.leakage_nightly"],
+            cwd=str(ROOT),
+            env=_subprocess_env(TENANTS=TENANT, API_BASE=API_BASE),
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        return result.returncode
+    # cron config is read from env at import; override on the instance for this run, then restore
+    config = leakage_nightly.config
+    saved = (config.TENANTS, config.API_BASE)
+    config.TENANTS = [TENANT]
+    config.API_BASE = API_BASE
+    try:
+        return leakage_nightly.main()
+    finally:
+        config.TENANTS, config.API_BASE = saved
+
 
+def _eval_chain() -> list[str]:
+    """Steps 2-4: /metrics/latest pre-eval, tiny eval -> DB, /metrics/latest post-eval."""
+    failures: list[str] = []
     # 2. GET /metrics/latest with auth (may 404 if no runs yet)
     print("2. GET /metrics/latest (pre-eval) ...")
     try:
         r = _get("/metrics/latest")
         if r.status_code not in (200, 404):
             failures.append(f"/metrics/latest => {r.status_code}")
-        print(f"   {r.status_code}")
+        print(f"   2: {r.status_code}")
     except Exception as e:
-        failures.append(f"/metrics/latest => {e}")
-        print(f"   FAIL: {e}")
-        return 1
+        print(f"   2: FAIL: {e}")
+        return failures + [f"/metrics/latest => {e}"]
 
     # 3. Run tiny eval (5 queries), confirm eval_run inserted
     print("3. Eval (5 queries) -> DB ...")
     dataset = ROOT / "scripts" / "smoke_queries.jsonl"
     if not dataset.exists():
-        failures.append("scripts/smoke_queries.jsonl not found")
-        return 1
+        return failures + ["scripts/smoke_queries.jsonl not found"]
     try:
-        env = os.environ.copy()
-        result = subprocess.run(
+        rc, err = _run_harness(
             [
-                sys.executable,
-                "-m",
-                "eval.harness",
                 "--dataset",
                 str(dataset),
                 "--base-url",
@@ -83,76 +187,99 @@ def main() -> int:
                 TENANT,
                 "--crawl-policy-version",
                 "smoke",
-            ],
-            cwd=str(ROOT),
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=120,
+            ]
         )
-        if result.returncode != 0:
-            failures.append(f"eval harness exit {result.returncode}: {result.stderr[:500]}")
-            print(f"   FAIL: {result.stderr[:300]}")
+        if rc != 0:
+            failures.append(f"eval harness exit {rc}: {err[:500]}")
+            print(f"   3: FAIL: {err[:300]}")
         else:
-            print("   ok")
-    except subprocess.TimeoutExpired:
-        failures.append("eval harness timeout")
-        return 1
+            print("   3: ok")
     except Exception as e:
-        failures.append(f"eval => {e}")
-        print(f"   FAIL: {e}")
-        return 1
+        print(f"   3: FAIL: {e}")
+        return failures + [f"eval => {e}"]
 
     # 4. GET /metrics/latest => 200 (eval_run exists)
     print("4. GET /metrics/latest (post-eval) ...")
     try:
         r = _get("/metrics/latest")
         if not _ok(r):
-            failures.append(f"/metrics/latest post-eval => {r.status_code}")
-            return 1
-        print("   200 ok")
+            return failures + [f"/metrics/latest post-eval => {r.status_code}"]
+        print("   4: 200 ok")
     except Exception as e:
-        failures.append(f"/metrics/latest => {e}")
-        return 1
+        return failures + [f"/metrics/latest => {e}"]
+    return failures
 
+
+def _leakage_chain() -> list[str]:
+    """Steps 5-6: run leakage once, then /monitor/leakage/latest."""
     # 5. Run leakage once
     print("5. Leakage ...")
     try:
-        env = os.environ.copy()
-        env["TENANTS"] = TENANT
-        env["API_BASE"] = API_BASE
-        result = subprocess.run(
-            [sys.executable, "-m", "cron.leakage_nightly"],
-            cwd=str(ROOT),
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+        rc = _run_leakage()
         # leakage exits 1 on fail (leaks found), 0 on pass
-        print(f"   exit {result.returncode}")
-    except subprocess.TimeoutExpired:
-        failures.append("leakage timeout")
-        return 1
+        print(f"   5: exit {rc}")
     except Exception as e:
-        failures.append(f"leakage => {e}")
-        return 1
+        return [f"leakage => {e}"]
 
     # 6. GET /monitor/leakage/latest => 200, monitor_event exists
     print("6. GET /monitor/leakage/latest ...")
     try:
         r = _get("/monitor/leakage/latest")
         if not _ok(r):
-            failures.append(f"/monitor/leakage/latest => {r.status_code}")
-            return 1
+            return [f"/monitor/leakage/latest => {r.status_code}"]
         data = r.json()
+        print("   6: 200 ok")
         if "last_checked_at" not in data:
-            failures.append("/monitor/leakage/latest missing last_checked_at")
-        print("   200 ok")
+            return ["/monitor/leakage/latest missing last_checked_at"]
     except Exception as e:
-        failures.append(f"/monitor/leakage/latest => {e}")
+        return [f"/monitor/leakage/latest => {e}"]
+    return []
+
+
+def main() -> int:
+    failures: list[str] = []
+
+    # 1. GET /health => ok true
+    print("1. GET /health ...")
+    try:
+        r = SESSION.get(f"{API_BASE}/health", timeout=10)
+        if not _ok(r):
+            failures.append(f"/health => {r.status_code}")
+        else:
+            data = r.json()
+            if not data.get("ok"):
+                failures.append("/health => ok not True")
+            else:
+                print("   ok")
+    except Exception as e:
+        failures.append(f"/health => {e}")
+        print(f"   FAIL: {e}")
         return 1
 
+    # Eval chain [2->3->4] and leakage chain [5->6] are independent; run them side by side.
+    # Output lines carry their step number since the two chains interleave.
+    real_stderr, sys.stderr = sys.stderr, _ThreadStderrTee(sys.stderr)
+    pool = ThreadPoolExecutor(max_workers=2)
+    started = time.monotonic()
+    chains = {"eval": pool.submit(_eval_chain), "leakage": pool.submit(_leakage_chain)}
+    timed_out = False
+    for name in sorted(chains):
+        remaining = CHAIN_TIMEOUTS[name] - (time.monotonic() - started)
+        try:
+            failures.extend(chains[name].result(timeout=max(remaining, 0.0)))
+        except FutureTimeoutError:
+            failures.append(f"{name} timeout after {CHAIN_TIMEOUTS[name]:.0f}s")
+            timed_out = True
+    sys.stderr = real_stderr
+
+    if timed_out:
+        # A running in-process chain cannot be cancelled and its worker thread is joined at
+        # interpreter exit; hard-exit like the subprocess timeout kill did
+        print("\nFAILURES:", failures, flush=True)
+        sys.stderr.flush()
+        os._exit(1)
+    pool.shutdown()
+
     if failures:
         print("\nFAILURES:", failures)
         return 1
@@ -1,20 +1,82 @@
 """Shared test DB bootstrap (guard + schema creation). Used by root conftest for all test paths."""
 
+import atexit
+import functools
 import logging
 import os
+import socket
+import time
 from pathlib import Path
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import ParseResult, urlparse, urlunparse
+
+from sqlalchemy import text
 
 _ROOT = Path(__file__).resolve().parent.parent
 
 _LOG = logging.getLogger(__name__)
 
-# Mixing guard: track which schema path ran in this session
-_alembic_invoked = False
-_ensure_tables_invoked = False
+# Mixing guard: bitfield of which schema paths ran in this session (one word, updated with |=)
+_ALEMBIC = 1
+_ENSURE_TABLES = 2
+_setup_state = 0
 
 TEST_SCHEMA_STRATEGY_DEFAULT = "alembic"
 
+# Static bootstrap statements, built once (statements with interpolated identifiers stay inline)
+_TEXTS = {
+    "select_db": text("SELECT 1 FROM pg_database WHERE datname = :n"),
+    "drop_schema": text("DROP SCHEMA IF EXISTS public CASCADE"),
+    "create_schema": text("CREATE SCHEMA public"),
+    "grant_public": text("GRANT ALL ON SCHEMA public TO public"),
+    "create_ext_vec": text("CREATE EXTENSION IF NOT EXISTS vector"),
+    # Tenant-scoped eval cleanup (row locks only; other tenants / xdist workers untouched)
+    "delete_eval_results": text("DELETE FROM eval_result WHERE tenant_id = ANY(:tenant_ids)"),
+    "delete_eval_runs": text("DELETE FROM eval_run WHERE tenant_id = ANY(:tenant_ids)"),
+    "delete_monitor_events": text("DELETE FROM monitor_event WHERE tenant_id = ANY(:tenant_ids)"),
+    "public_relations": text(
+        "SELECT relname, relkind FROM pg_class WHERE relnamespace = 'public'::regnamespace"
+    ),
+    "public_columns": text(
+        "SELECT table_name, column_name, data_type, is_nullable FROM information_schema.columns "
+        "WHERE table_schema = 'public'"
+    ),
+    # Server-side: reset public only if it has tables (one round trip, no client-side table list)
+    "reset_public_if_tables": text(
+        "DO $$ BEGIN "
+        "IF EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename NOT LIKE 'pg_%') THEN "
+        "DROP SCHEMA public CASCADE; "
+        "CREATE SCHEMA public; "
+        "GRANT ALL ON SCHEMA public TO public; "
+        "END IF; "
+        "END $$"
+    ),
+}
+
+# AUTOCOMMIT engines for bootstrap DDL, one per URL, reused for the whole session (disposed at exit)
+_admin_engines: dict = {}
+
+
+def _admin_engine(url: str):
+    """Return the pooled AUTOCOMMIT engine for url, creating it on first use."""
+    eng = _admin_engines.get(url)
+    if eng is None:
+        from sqlalchemy import create_engine
+
+        eng = create_engine(
+            url, isolation_level="AUTOCOMMIT", pool_pre_ping=True, pool_size=2, max_overflow=0
+        )
+        _admin_engines[url] = eng
+    return eng
+
+
+def _dispose_admin_engines() -> None:
+    for eng in _admin_engines.values():
+        eng.dispose()
+    _admin_engines.clear()
+
+
+atexit.register(_dispose_admin_engines)
+
 
 def get_test_schema_strategy() -> str:
     """Return TEST_SCHEMA_STRATEGY: 'alembic' (default) or 'ensure_tables'."""
@@ -27,29 +89,43 @@ def get_test_schema_strategy() -> str:
     return v
 
 
+_MIXED_SETUP_ERROR = (
+    "Mixed schema setup: both Alembic and ensure_tables/create_all ran. "
+    "Set TEST_SCHEMA_STRATEGY=alembic (default) or TEST_SCHEMA_STRATEGY=ensure_tables "
+    "and ensure only one path runs. Fix: export TEST_SCHEMA_STRATEGY=alembic"
+)
+# (setup state, requested strategy) -> error for switching paths; any other pair is allowed
+_SETUP_ERRORS = {
+    (_ENSURE_TABLES, "alembic"): (
+        "Cannot run Alembic: ensure_tables path already ran. "
+        "Use TEST_SCHEMA_STRATEGY=alembic from the start. Fix: export TEST_SCHEMA_STRATEGY=alembic"
+    ),
+    (_ALEMBIC, "ensure_tables"): (
+        "Cannot run ensure_tables: Alembic path already ran. "
+        "Use TEST_SCHEMA_STRATEGY=ensure_tables from the start. Fix: export TEST_SCHEMA_STRATEGY=ensure_tables"
+    ),
+}
+
+
 def assert_not_mixed_schema_setup(strategy: str) -> None:
-    """Raise RuntimeError if both Alembic and ensure_tables paths have run in this session."""
-    if _alembic_invoked and _ensure_tables_invoked:
-        raise RuntimeError(
-            "Mixed schema setup: both Alembic and ensure_tables/create_all ran. "
-            "Set TEST_SCHEMA_STRATEGY=alembic (default) or TEST_SCHEMA_STRATEGY=ensure_tables "
-            "and ensure only one path runs. Fix: export TEST_SCHEMA_STRATEGY=alembic"
-        )
-    if strategy == "alembic" and _ensure_tables_invoked:
-        raise RuntimeError(
-            "Cannot run Alembic: ensure_tables path already ran. "
-            "Use TEST_SCHEMA_STRATEGY=alembic from the start. Fix: export TEST_SCHEMA_STRATEGY=alembic"
-        )
-    if strategy == "ensure_tables" and _alembic_invoked:
-        raise RuntimeError(
-            "Cannot run ensure_tables: Alembic path already ran. "
-            "Use TEST_SCHEMA_STRATEGY=ensure_tables from the start. Fix: export TEST_SCHEMA_STRATEGY=ensure_tables"
-        )
+    """Raise RuntimeError if both Alembic and ensure_tables paths have run in this session,
+    or if strategy is the other path from the one that already ran."""
+    if _setup_state == _ALEMBIC | _ENSURE_TABLES:
+        raise RuntimeError(_MIXED_SETUP_ERROR)
+    msg = _SETUP_ERRORS.get((_setup_state, strategy))
+    if msg:
+        raise RuntimeError(msg)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse(url: str) -> ParseResult:
+    """urlparse, cached: the bootstrap helpers parse the same few URLs repeatedly."""
+    return urlparse(url)
 
 
 def parse_db_name(url: str) -> str:
     """Extract database name from postgres URL (path without leading slash)."""
-    p = urlparse(url)
+    p = _parse(url)
     path = (p.path or "").strip("/")
     return path.split("/")[0] if path else ""
 
@@ -57,7 +133,7 @@ def parse_db_name(url: str) -> str:
 def parse_db_user(url: str) -> str:
     """Extract database user from postgres URL. Returns 'postgres' if unparseable."""
     try:
-        p = urlparse(url)
+        p = _parse(url)
         u = (p.username or "postgres").strip()
         if u and all(c.isalnum() or c == "_" for c in u):
             return u
@@ -82,7 +158,7 @@ def _assert_schema_reset_safe(url: str) -> None:
 
 def build_test_url(url: str) -> str:
     """Derive test DB URL by appending '_test' to db name. Idempotent if already ends with _test."""
-    p = urlparse(url)
+    p = _parse(url)
     db_name = parse_db_name(url)
     if db_name.endswith("_test"):
         return url
@@ -90,10 +166,21 @@ def build_test_url(url: str) -> str:
     return urlunparse((p.scheme, p.netloc, f"/{test_db}", "", "", ""))
 
 
+@functools.lru_cache(maxsize=4)
 def postgres_reachable(url: str, timeout: int = 2) -> bool:
-    """Return True if Postgres at url is reachable. Uses short timeout to avoid flaky CI."""
+    """Return True if Postgres at url is reachable. Uses short timeout to avoid flaky CI.
+    Cached per (url, timeout) for the process: conftests probe the same URL repeatedly.
+    Default is a TCP connect to host:port (one RTT, no auth); STRICT_DB_PROBE=1 opens a real
+    SQLAlchemy connection instead (port up but DB not accepting queries)."""
     if not url or not url.strip().lower().startswith("postgresql"):
         return False
+    if os.environ.get("STRICT_DB_PROBE", "").lower() not in ("1", "true", "yes"):
+        try:
+            p = _parse(url)
+            with socket.create_connection((p.hostname or "localhost", p.port or 5432), timeout=timeout):
+                return True
+        except (OSError, ValueError):
+            return False
     eng = None
     try:
         from sqlalchemy import create_engine
@@ -113,7 +200,7 @@ def postgres_reachable(url: str, timeout: int = 2) -> bool:
 
 def _is_local_postgres(url: str) -> bool:
     """Return True if URL points to local Postgres (localhost/127.0.0.1)."""
-    p = urlparse(url)
+    p = _parse(url)
     host = (p.hostname or "").lower()
     return host in ("localhost", "127.0.0.1", "")
 
@@ -121,79 +208,71 @@ def _is_local_postgres(url: str) -> bool:
 def create_database_if_missing(url: str) -> None:
     """Create the database if it does not exist. Local Postgres only (no network)."""
     if not _is_local_postgres(url):
-        _LOG.warning("Skipping create_database_if_missing: %s is not local", urlparse(url).hostname)
+        _LOG.warning("Skipping create_database_if_missing: %s is not local", _parse(url).hostname)
         return
     db_name = parse_db_name(url)
     if not db_name or not all(c.isalnum() or c == "_" for c in db_name):
         return
-    p = urlparse(url)
+    p = _parse(url)
     admin_url = urlunparse((p.scheme, p.netloc, "/postgres", "", "", ""))
-    from sqlalchemy import create_engine, text
-
-    engine = create_engine(admin_url, isolation_level="AUTOCOMMIT")
-    try:
-        with engine.connect() as conn:
-            r = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :n"), {"n": db_name})
-            if r.scalar() is None:
-                conn.execute(text(f'CREATE DATABASE "{db_name}"'))
-                _LOG.info("Created test database: %s", db_name)
-    finally:
-        engine.dispose()
+    with _admin_engine(admin_url).connect() as conn:
+        r = conn.execute(_TEXTS["select_db"], {"n": db_name})
+        if r.scalar() is None:
+            conn.execute(text(f'CREATE DATABASE "{db_name}"'))
+            _LOG.info("Created test database: %s", db_name)
 
 
 def drop_all_tables(url: str) -> None:
     """Drop all tables in public schema. Local Postgres only (no network)."""
     if not _is_local_postgres(url):
-        _LOG.warning("Skipping drop_all_tables: %s is not local", urlparse(url).hostname)
+        _LOG.warning("Skipping drop_all_tables: %s is not local", _parse(url).hostname)
         return
-    from sqlalchemy import create_engine, text
+    with _admin_engine(url).connect() as conn:
+        conn.execute(_TEXTS["reset_public_if_tables"])
+    _LOG.info("Reset public schema (if it had tables)")
 
-    engine = create_engine(url, isolation_level="AUTOCOMMIT")
-    try:
-        with engine.connect() as conn:
-            r = conn.execute(
-                text(
-                    "SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename NOT LIKE 'pg_%'"
-                )
-            )
-            tables = [row[0] for row in r]
-            if tables:
-                conn.execute(text("DROP SCHEMA public CASCADE"))
-                conn.execute(text("CREATE SCHEMA public"))
-                conn.execute(text("GRANT ALL ON SCHEMA public TO public"))
-                _LOG.info("Dropped %d tables in public schema", len(tables))
-    finally:
-        engine.dispose()
+
+# Memoized Alembic Config: (alembic.ini mtime, versions/ mtime) -> Config
+_alembic_cfg_cache: dict = {}
 
 
 def _alembic_config_with_url(db_url: str):
-    """Build Alembic config with sqlalchemy.url set to db_url."""
+    """Return Alembic config with sqlalchemy.url set to db_url.
+    The Config is reused until alembic.ini or versions/ changes; only the URL is swapped."""
     from alembic.config import Config
 
     alembic_ini = _ROOT / "alembic.ini"
     if not alembic_ini.exists():
         raise FileNotFoundError(f"alembic.ini not found at {alembic_ini}")
-    cfg = Config(str(alembic_ini))
-    cfg.set_main_option("sqlalchemy.url", db_url)
+    key = (alembic_ini.stat().st_mtime_ns, (_ROOT / "alembic" / "versions").stat().st_mtime_ns)
+    cfg = _alembic_cfg_cache.get(key)
+    if cfg is None:
+        _alembic_cfg_cache.clear()
+        cfg = Config(str(alembic_ini))
+        _alembic_cfg_cache[key] = cfg
+    if cfg.get_main_option("sqlalchemy.url") != db_url:
+        cfg.set_main_option("sqlalchemy.url", db_url)
     return cfg
 
 
 def _mark_alembic_invoked() -> None:
-    global _alembic_invoked
-    _alembic_invoked = True
+    global _setup_state
+    _setup_state |= _ALEMBIC
 
 
 def _mark_ensure_tables_invoked() -> None:
-    global _ensure_tables_invoked
-    _ensure_tables_invoked = True
+    global _setup_state
+    _setup_state |= _ENSURE_TABLES
 
 
-def run_alembic_upgrade_head(db_url: str) -> None:
-    """Run alembic upgrade head with the given db_url. Forces sqlalchemy.url dynamically."""
+def run_alembic_upgrade_head(db_url: str, cfg=None) -> None:
+    """Run alembic upgrade head with the given db_url. Forces sqlalchemy.url dynamically.
+    Pass cfg to reuse an already-built Config (and any connection in cfg.attributes)."""
     assert_not_mixed_schema_setup("alembic")
     from alembic import command
 
-    cfg = _alembic_config_with_url(db_url)
+    if cfg is None:
+        cfg = _alembic_config_with_url(db_url)
     prev = os.environ.get("DATABASE_URL")
     os.environ["DATABASE_URL"] = db_url
     try:
@@ -207,9 +286,9 @@ def run_alembic_upgrade_head(db_url: str) -> None:
             os.environ.pop("DATABASE_URL", None)
 
 
-def run_alembic_upgrade(db_url: str) -> None:
+def run_alembic_upgrade(db_url: str, cfg=None) -> None:
     """Run alembic upgrade head. Idempotent. Forces sqlalchemy.url dynamically."""
-    run_alembic_upgrade_head(db_url)
+    run_alembic_upgrade_head(db_url, cfg)
 
 
 def _run_alembic_downgrade_base(db_url: str) -> None:
@@ -253,7 +332,7 @@ def _recreate_schema_migration(db_url: str) -> bool:
 def _recreate_schema_ensure_tables(db_url: str) -> None:
     """Schema via ensure_tables() only. Never calls Alembic. DB must be empty (Step 2)."""
     assert_not_mixed_schema_setup("ensure_tables")
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import create_engine
 
     from apps.api.db import ensure_tables
 
@@ -263,7 +342,7 @@ def _recreate_schema_ensure_tables(db_url: str) -> None:
     try:
         if db_url.strip().lower().startswith("postgresql"):
             with eng.begin() as conn:
-                conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                conn.execute(_TEXTS["create_ext_vec"])
         ensure_tables(bind=eng)
     finally:
         eng.dispose()
@@ -277,7 +356,7 @@ def _recreate_schema_ensure_tables(db_url: str) -> None:
 def _mask_password(url: str) -> str:
     """Mask password in DATABASE_URL for logging."""
     try:
-        p = urlparse(url)
+        p = _parse(url)
         netloc = p.netloc
         if p.password and "@" in netloc:
             user_part, host_part = netloc.rsplit("@", 1)
@@ -359,20 +438,30 @@ def run_test_db_schema_fixture() -> None:
     authority = _get_schema_authority()
     db_name = parse_db_name(url)
     db_user = parse_db_user(url)
-    host = urlparse(url).hostname or "localhost"
+    host = _parse(url).hostname or "localhost"
     print(f"Reset test DB schema: {host}/{db_name} (authority={authority})")
 
-    from sqlalchemy import create_engine, text
-
-    engine = create_engine(url, isolation_level="AUTOCOMMIT")
-    try:
+    reset = [
+        _TEXTS["drop_schema"],
+        _TEXTS["create_schema"],
+        text(f"GRANT ALL ON SCHEMA public TO {db_user}"),
+        _TEXTS["grant_public"],
+    ]
+    engine = _admin_engine(url)
+    if engine.dialect.driver == "psycopg":
+        # psycopg 3 pipeline mode: send all statements without waiting for each reply
+        raw = engine.raw_connection()
+        try:
+            dbapi = raw.driver_connection
+            with dbapi.pipeline():
+                for stmt in reset:
+                    dbapi.execute(stmt.text)
+        finally:
+            raw.close()
+    else:
         with engine.connect() as conn:
-            conn.execute(text("DROP SCHEMA IF EXISTS public CASCADE"))
-            conn.execute(text("CREATE SCHEMA public"))
-            conn.execute(text(f"GRANT ALL ON SCHEMA public TO {db_user}"))
-            conn.execute(text("GRANT ALL ON SCHEMA public TO public"))
-    finally:
-        engine.dispose()
+            for stmt in reset:
+                conn.execute(stmt)
 
     if authority == "alembic":
         if not _recreate_schema_migration(url):
@@ -382,3 +471,67 @@ def run_test_db_schema_fixture() -> None:
     else:
         _recreate_schema_ensure_tables(url)
     os.environ["DATABASE_URL"] = url
+
+
+_SCHEMA_RESET_WAIT_SECONDS = 300.0
+
+
+def run_test_db_schema_once(shared_dir: Path) -> None:
+    """run_test_db_schema_fixture once per pytest run. Without xdist that is just a call; under xdist
+    the first worker to create shared_dir/db_schema_reset.started resets the schema and writes
+    .done ("ok"/"failed"); the others wait for it instead of dropping public under running workers.
+    shared_dir: a directory shared by all workers of this run (tmp_path_factory basetemp's parent)."""
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        run_test_db_schema_fixture()
+        return
+    started = shared_dir / "db_schema_reset.started"
+    done = shared_dir / "db_schema_reset.done"
+    try:
+        os.close(os.open(started, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        deadline = time.monotonic() + _SCHEMA_RESET_WAIT_SECONDS
+        while not done.exists():
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Timed out waiting for another xdist worker's schema reset ({done})")
+            time.sleep(0.1)
+        if done.read_text() != "ok":
+            raise RuntimeError("Test DB schema reset failed on another xdist worker")
+        return
+    try:
+        run_test_db_schema_fixture()
+    except BaseException:
+        done.write_text("failed")
+        raise
+    done.write_text("ok")
+
+
+def warm_embedding_provider() -> None:
+    """Construct the embedding provider once at session start so the first DB test doesn't pay its init."""
+    try:
+        from apps.api.services.embedding_provider import get_embedding_provider
+    except ImportError:
+        return
+    get_embedding_provider().embed(["warm"])
+
+
+def delete_eval_rows_for_tenants(tenant_ids: list[str]) -> None:
+    """Delete eval_result, eval_run and monitor_event rows for tenant_ids only.
+    No TRUNCATE: that takes ACCESS EXCLUSIVE and wipes every tenant's rows, including other workers' seeds."""
+    url = os.environ.get("DATABASE_TEST_URL")
+    if not url or not tenant_ids:
+        return
+    params = {"tenant_ids": list(tenant_ids)}
+    with _admin_engine(url).connect() as conn:
+        conn.execute(_TEXTS["delete_eval_results"], params)
+        conn.execute(_TEXTS["delete_eval_runs"], params)
+        conn.execute(_TEXTS["delete_monitor_events"], params)
+
+
+def public_schema_snapshot() -> tuple[frozenset, frozenset]:
+    """(relations, columns) of the test DB's public schema: (relname, relkind) and
+    (table, column, type, nullable) rows. Names, not OIDs: the schema fixture drops and recreates public."""
+    url = os.environ["DATABASE_TEST_URL"]
+    with _admin_engine(url).connect() as conn:
+        relations = frozenset(tuple(r) for r in conn.execute(_TEXTS["public_relations"]))
+        columns = frozenset(tuple(r) for r in conn.execute(_TEXTS["public_columns"]))
+    return relations, columns
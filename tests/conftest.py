@@ -13,18 +13,60 @@ os.environ.setdefault("EMBED_PROVIDER", "deterministic")
 from tests._db_bootstrap import (
     postgres_reachable,
     run_alembic_upgrade,
-    run_test_db_schema_fixture,
+    run_test_db_schema_once,
+    delete_eval_rows_for_tenants,
 )  # noqa: F401
 
 
 @pytest.fixture(scope="session", autouse=True)
-def test_db_schema():
+def test_db_schema(tmp_path_factory):
     """Reset test DB schema at session start. Only runs if DATABASE_TEST_URL is set and reachable.
     Drops schema public CASCADE, recreates it, then applies schema via SCHEMA_AUTHORITY (alembic or ensure_tables).
     Safety: db name must contain '_test' or ALLOW_TEST_DB_RESET=true."""
     if not _db_available_for_tests():
         return
-    run_test_db_schema_fixture()
+    # Once per run: under xdist only the first worker resets; the rest wait (basetemp parent is shared)
+    run_test_db_schema_once(tmp_path_factory.getbasetemp().parent)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the session: the FastAPI app is imported and built once per worker."""
+    from fastapi.testclient import TestClient
+
+    from apps.api.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_client():
+    """In-process ASGI client for @pytest.mark.anyio tests: requests are awaited on the test's loop,
+    so several can be in flight at once (no TestClient thread portal)."""
+    import httpx
+
+    from apps.api.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def clean_eval_tables(request):
+    """Delete the calling module's EVAL_TENANTS rows from eval_run/eval_result/monitor_event
+    before and after the test. Scoped to those tenants: other modules' seeded rows survive."""
+    tenant_ids = list(request.module.EVAL_TENANTS)
+    db = _db_available_for_tests()
+    if db:
+        delete_eval_rows_for_tenants(tenant_ids)
+    yield
+    if db:
+        delete_eval_rows_for_tenants(tenant_ids)
 
 
 def _db_available_for_tests() -> bool:
@@ -4,7 +4,7 @@ import os
 
 import pytest
 
-from tests._db_bootstrap import get_test_schema_strategy, run_alembic_upgrade
+from tests._db_bootstrap import _alembic_config_with_url, get_test_schema_strategy, run_alembic_upgrade
 
 
 @pytest.mark.skipif(
@@ -16,7 +16,19 @@ from tests._db_bootstrap import get_test_schema_strategy, run_alembic_upgrade
     reason="Alembic idempotency test only applies when TEST_SCHEMA_STRATEGY=alembic",
 )
 def test_alembic_upgrade_head_twice_no_exception():
-    """Run alembic upgrade head twice in the same session; must not raise."""
+    """Run alembic upgrade head twice in the same session; must not raise.
+    Both passes share one Config (script graph loaded once) and one connection."""
+    from sqlalchemy import create_engine
+
     url = os.environ.get("DATABASE_URL_TEST") or os.environ.get("DATABASE_TEST_URL")
-    run_alembic_upgrade(url)
-    run_alembic_upgrade(url)  # second run must be idempotent, no DuplicateTable etc.
+    cfg = _alembic_config_with_url(url)
+    engine = create_engine(url)
+    try:
+        with engine.begin() as conn:
+            cfg.attributes["connection"] = conn
+            run_alembic_upgrade(url, cfg)
+            run_alembic_upgrade(url, cfg)  # second run must be idempotent, no DuplicateTable etc.
+    finally:
+        # Config is memoized by _db_bootstrap; don't leak this connection into later upgrades
+        cfg.attributes.pop("connection", None)
+        engine.dispose()
@@ -1,22 +1,29 @@
 """Tests for /answer cache integration: version-based invalidation and tenant isolation."""
 
+import asyncio
 import json
 import os
+import threading
+from types import SimpleNamespace
 
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch
+
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
+import httpx
+from unittest.mock import DEFAULT, MagicMock, patch
 
 # Ensure test env before imports
 os.environ.setdefault("ENV", "test")
 
-from apps.api.main import app
 from apps.api.schemas.responses import RetrieveCandidate, RetrieveDebug, RetrieveDebugMerge, RetrieveDebugVector, RetrieveResponse
 from apps.api.services.repo import upsert_tenant_index_version
 from apps.api.tests.conftest import requires_db
 
-client = TestClient(app)
-
 
 def _candidates(score: float = 0.9):
     return [
@@ -46,34 +53,62 @@ def _mock_retrieve(score: float = 0.9):
     )
 
 
+# Built once and shared: the answer service only reads the response
+_CACHED_MOCK_RETRIEVE = _mock_retrieve()
+
+
 def _fake_llm_gen(prompt, evidence_items):
     eids = [e["evidence_id"] for e in evidence_items]
     return json.dumps({"answer": "Cached answer.", "claims": [{"text": "Cached.", "evidence_ids": eids, "confidence": 0.9}]})
 
 
+@pytest.fixture(scope="module")
+def mocked_answer_deps():
+    """Section lookup, evidence insert and LLM patched once for the module; yields the LLM generate mock."""
+    generate = MagicMock(side_effect=_fake_llm_gen)
+    with patch.multiple(
+        "apps.api.services.answer",
+        get_section_by_id=MagicMock(return_value={"text": "Test.", "version_hash": "vh1"}),
+        insert_evidence=DEFAULT,
+        get_llm_provider=MagicMock(return_value=SimpleNamespace(generate=generate)),
+    ):
+        yield generate
+
+
+@pytest.fixture
+def retrieve_mock(mocked_answer_deps):
+    """retrieve_ac patched per test: call counts are what each test asserts on."""
+    with patch("apps.api.services.answer.retrieve_ac", return_value=_CACHED_MOCK_RETRIEVE) as m:
+        yield m
+
+
+async def _post_answer(ac: httpx.AsyncClient, tenant_id: str, query: str) -> httpx.Response:
+    return await ac.post("/answer", json={"query": query}, headers={"Authorization": f"Bearer tenant:{tenant_id}"})
+
+
+@pytest.fixture
+def llm_generate(mocked_answer_deps):
+    """Module-wide LLM generate mock, with call counts reset for this test."""
+    mocked_answer_deps.reset_mock()
+    return mocked_answer_deps
+
+
 @requires_db
-def test_same_query_second_call_hits_cache() -> None:
-    """Create versions v1, call /answer twice; second call returns cached payload (retrieve not called again)."""
+def test_same_query_second_call_hits_cache(client, retrieve_mock, llm_generate) -> None:
+    """Create versions v1, call /answer twice; second call returns cached payload (retrieve and LLM not called again)."""
     tenant_id = "tenant_cache_hit"
     upsert_tenant_index_version(tenant_id, ac_version_hash="ac_v1", ec_version_hash="ec_v1")
 
-    with patch("apps.api.services.answer.retrieve_ac") as mock_retrieve:
-        mock_retrieve.return_value = _mock_retrieve()
-        with patch("apps.api.services.answer.get_section_by_id", return_value={"text": "Test.", "version_hash": "vh1"}):
-            with patch("apps.api.services.answer.insert_evidence"):
-                with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-                    mock_llm.return_value = type("M", (), {"generate": lambda s, p, e: _fake_llm_gen(p, e)})()
-
-                    r1 = client.post(
-                        "/answer",
-                        json={"query": "what is the policy"},
-                        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
-                    )
-                    r2 = client.post(
-                        "/answer",
-                        json={"query": "what is the policy"},
-                        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
-                    )
+    r1 = client.post(
+        "/answer",
+        json={"query": "what is the policy"},
+        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
+    )
+    r2 = client.post(
+        "/answer",
+        json={"query": "what is the policy"},
+        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
+    )
 
     assert r1.status_code == 200
     assert r2.status_code == 200
@@ -81,51 +116,40 @@ def test_same_query_second_call_hits_cache() -> None:
     assert r2.json()["refused"] is False
     assert r1.json()["answer"] == r2.json()["answer"]
     # Second call should hit cache: retrieve_ac called only once
-    assert mock_retrieve.call_count == 1
+    assert retrieve_mock.call_count == 1
+    assert llm_generate.call_count == 1
 
 
 @requires_db
-def test_ac_version_change_causes_cache_miss() -> None:
+def test_ac_version_change_causes_cache_miss(client, retrieve_mock) -> None:
     """Update ac_version_hash to v2 (simulate re-ingest); call /answer; assert cache miss and new entry."""
     tenant_id = "tenant_ac_invalidate"
     upsert_tenant_index_version(tenant_id, ac_version_hash="ac_v1", ec_version_hash="ec_v1")
 
-    with patch("apps.api.services.answer.retrieve_ac") as mock_retrieve:
-        mock_retrieve.return_value = _mock_retrieve()
-        with patch("apps.api.services.answer.get_section_by_id", return_value={"text": "Test.", "version_hash": "vh1"}):
-            with patch("apps.api.services.answer.insert_evidence"):
-                with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-                    mock_llm.return_value = type("M", (), {"generate": lambda s, p, e: _fake_llm_gen(p, e)})()
-
-                    r1 = client.post(
-                        "/answer",
-                        json={"query": "same query"},
-                        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
-                    )
-                    assert r1.status_code == 200
-                    assert mock_retrieve.call_count == 1
+    r1 = client.post(
+        "/answer",
+        json={"query": "same query"},
+        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
+    )
+    assert r1.status_code == 200
+    assert retrieve_mock.call_count == 1
 
     upsert_tenant_index_version(tenant_id, ac_version_hash="ac_v2", ec_version_hash="ec_v1")
+    retrieve_mock.reset_mock()
 
-    with patch("apps.api.services.answer.retrieve_ac") as mock_retrieve:
-        mock_retrieve.return_value = _mock_retrieve()
-        with patch("apps.api.services.answer.get_section_by_id", return_value={"text": "Test.", "version_hash": "vh1"}):
-            with patch("apps.api.services.answer.insert_evidence"):
-                with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-                    mock_llm.return_value = type("M", (), {"generate": lambda s, p, e: _fake_llm_gen(p, e)})()
-
-                    r2 = client.post(
-                        "/answer",
-                        json={"query": "same query"},
-                        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
-                    )
+    r2 = client.post(
+        "/answer",
+        json={"query": "same query"},
+        headers={"Authorization": f"Bearer tenant:{tenant_id}"},
+    )
 
     assert r2.status_code == 200
-    assert mock_retrieve.call_count == 1
+    assert retrieve_mock.call_count == 1
 
 
 @requires_db
-def test_tenant_b_never_hits_tenant_a_cache() -> None:
+@pytest.mark.anyio
+async def test_tenant_b_never_hits_tenant_a_cache(async_client, retrieve_mock) -> None:
     """Tenant B with same query as Tenant A never gets Tenant A's cached answer."""
     tenant_a = "tenant_a_isolation"
     tenant_b = "tenant_b_isolation"
@@ -133,39 +157,56 @@ def test_tenant_b_never_hits_tenant_a_cache() -> None:
     upsert_tenant_index_version(tenant_a, ac_version_hash="ac_v1", ec_version_hash="ec_v1")
     upsert_tenant_index_version(tenant_b, ac_version_hash="ac_v1", ec_version_hash="ec_v1")
 
-    with patch("apps.api.services.answer.retrieve_ac") as mock_retrieve:
-        mock_retrieve.return_value = _mock_retrieve()
-        with patch("apps.api.services.answer.get_section_by_id", return_value={"text": "Test.", "version_hash": "vh1"}):
-            with patch("apps.api.services.answer.insert_evidence"):
-                with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-                    mock_llm.return_value = type("M", (), {"generate": lambda s, p, e: _fake_llm_gen(p, e)})()
-
-                    ra1 = client.post(
-                        "/answer",
-                        json={"query": query},
-                        headers={"Authorization": f"Bearer tenant:{tenant_a}"},
-                    )
-                    rb1 = client.post(
-                        "/answer",
-                        json={"query": query},
-                        headers={"Authorization": f"Bearer tenant:{tenant_b}"},
-                    )
-                    ra2 = client.post(
-                        "/answer",
-                        json={"query": query},
-                        headers={"Authorization": f"Bearer tenant:{tenant_a}"},
-                    )
-                    rb2 = client.post(
-                        "/answer",
-                        json={"query": query},
-                        headers={"Authorization": f"Bearer tenant:{tenant_b}"},
-                    )
+    # Sequential on purpose: the call-count assertion depends on A1/B1 missing before A2/B2
+    ra1 = await _post_answer(async_client, tenant_a, query)
+    rb1 = await _post_answer(async_client, tenant_b, query)
+    ra2 = await _post_answer(async_client, tenant_a, query)
+    rb2 = await _post_answer(async_client, tenant_b, query)
 
     assert ra1.status_code == 200
     assert rb1.status_code == 200
     assert ra2.status_code == 200
     assert rb2.status_code == 200
     # A1 miss, B1 miss, A2 hit, B2 hit -> retrieve called only twice
-    assert mock_retrieve.call_count == 2
+    assert retrieve_mock.call_count == 2
     assert ra1.json()["answer"] == ra2.json()["answer"]
     assert rb1.json()["answer"] == rb2.json()["answer"]
+
+
+@requires_db
+@pytest.mark.anyio
+async def test_concurrent_same_query_runs_pipeline_once(async_client, retrieve_mock) -> None:
+    """Concurrent identical requests for one tenant share one pipeline run and one answer.
+    retrieve_ac blocks until all requests have entered answer() (claimed the key), so they overlap
+    for real: without single-flight every request would reach retrieve_ac."""
+    from apps.api.services import answer as answer_mod
+
+    tenant_id = "tenant_cache_concurrent"
+    n_requests = 4
+    upsert_tenant_index_version(tenant_id, ac_version_hash="ac_v1", ec_version_hash="ec_v1")
+
+    claim_inflight = answer_mod._claim_inflight
+    claims = []
+    all_entered = threading.Event()
+
+    def counting_claim(key):
+        result = claim_inflight(key)
+        claims.append(key)
+        if len(claims) == n_requests:
+            all_entered.set()
+        return result
+
+    def blocking_retrieve(*_args, **_kwargs):
+        all_entered.wait(10)
+        return _CACHED_MOCK_RETRIEVE
+
+    retrieve_mock.side_effect = blocking_retrieve
+    with patch.object(answer_mod, "_claim_inflight", side_effect=counting_claim):
+        responses = await asyncio.gather(
+            *(_post_answer(async_client, tenant_id, "concurrent query") for _ in range(n_requests))
+        )
+
+    assert all_entered.is_set(), "requests did not overlap inside answer()"
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.json()["answer"] for r in responses}) == 1
+    assert retrieve_mock.call_count == 1
@@ -11,102 +11,49 @@ import pytest
 from apps.api.services.crawl_rules import classify_url, is_url_allowed
 
 
-def test_deny_quote_flow_on_restrictive_host() -> None:
+# (url, reason hints): denied URLs; if hints are given, at least one must appear in the lowercased reason
+DENY_CASES: tuple[tuple[str, tuple[str, ...]], ...] = (
     # quote.unitedglobalvanline.com: allow info_static, deny quote_flow
-    allowed, reason = is_url_allowed("https://quote.unitedglobalvanline.com/quote/123")
+    ("https://quote.unitedglobalvanline.com/quote/123", ("quote-flow", "/quote")),
+    ("https://example.com/quote/123", ("quote-flow", "/quote")),
+    ("https://example.com/get-a-quote?foo=1", ()),
+    ("https://example.com/booking", ()),
+    ("https://example.com/book/now", ()),
+    ("https://example.com/estimate", ()),
+    ("https://example.com/checkout", ()),
+    ("https://example.com/reserve/123", ()),
+    ("https://example.com/page?step=2", ("step", "quote-flow")),
+    ("https://example.com/page?session=abc", ()),
+    ("https://example.com/page?token=xyz", ()),
+    ("https://example.com/page?lead=123", ()),
+    ("https://example.com/page?quote_id=99", ()),
+)
+
+ALLOW_CASES: tuple[str, ...] = (
+    # restrictive host with no quote-flow pattern -> info_static
+    "https://quote.unitedglobalvanline.com/about",
+    "https://www.quote.unitedglobalvanline.com/",  # www stripped, root path is info_static
+    "https://example.com/page",
+    "https://example.com/about",  # no deny prefix matches
+    "https://example.com/page?foo=1&bar=2",
+)
+
+
+@pytest.mark.parametrize("url,reason_hints", DENY_CASES)
+def test_url_denied(url: str, reason_hints: tuple[str, ...]) -> None:
+    allowed, reason = is_url_allowed(url)
     assert allowed is False
-    assert "quote-flow" in reason or "/quote" in reason
-
-
-def test_allow_info_static_on_restrictive_host() -> None:
-    # quote.unitedglobalvanline.com with no quote-flow pattern -> allowed
-    allowed, _ = is_url_allowed("https://quote.unitedglobalvanline.com/about")
-    assert allowed is True
+    if reason_hints:
+        assert any(h in reason.lower() for h in reason_hints), reason
 
 
-def test_allow_info_static_root_on_restrictive_host() -> None:
-    allowed, _ = is_url_allowed("https://www.quote.unitedglobalvanline.com/")
-    assert allowed is True  # www stripped, root path is info_static
-
-
-def test_allow_other_host() -> None:
-    allowed, reason = is_url_allowed("https://example.com/page")
+@pytest.mark.parametrize("url", ALLOW_CASES)
+def test_url_allowed(url: str) -> None:
+    allowed, reason = is_url_allowed(url)
     assert allowed is True
     assert reason == ""
 
 
-def test_deny_path_quote() -> None:
-    allowed, reason = is_url_allowed("https://example.com/quote/123")
-    assert allowed is False
-    assert "quote-flow" in reason or "/quote" in reason
-
-
-def test_deny_path_get_a_quote() -> None:
-    allowed, _ = is_url_allowed("https://example.com/get-a-quote?foo=1")
-    assert allowed is False
-
-
-def test_deny_path_booking() -> None:
-    allowed, _ = is_url_allowed("https://example.com/booking")
-    assert allowed is False
-
-
-def test_deny_path_book() -> None:
-    allowed, _ = is_url_allowed("https://example.com/book/now")
-    assert allowed is False
-
-
-def test_deny_path_estimate() -> None:
-    allowed, _ = is_url_allowed("https://example.com/estimate")
-    assert allowed is False
-
-
-def test_deny_path_checkout() -> None:
-    allowed, _ = is_url_allowed("https://example.com/checkout")
-    assert allowed is False
-
-
-def test_deny_path_reserve() -> None:
-    allowed, _ = is_url_allowed("https://example.com/reserve/123")
-    assert allowed is False
-
-
-def test_allow_similar_path() -> None:
-    allowed, _ = is_url_allowed("https://example.com/about")  # no deny prefix matches
-    assert allowed is True
-
-
-def test_deny_query_step() -> None:
-    allowed, reason = is_url_allowed("https://example.com/page?step=2")
-    assert allowed is False
-    assert "step" in reason.lower() or "quote-flow" in reason.lower()
-
-
-def test_deny_query_session() -> None:
-    allowed, _ = is_url_allowed("https://example.com/page?session=abc")
-    assert allowed is False
-
-
-def test_deny_query_token() -> None:
-    allowed, _ = is_url_allowed("https://example.com/page?token=xyz")
-    assert allowed is False
-
-
-def test_deny_query_lead() -> None:
-    allowed, _ = is_url_allowed("https://example.com/page?lead=123")
-    assert allowed is False
-
-
-def test_deny_query_quote_id() -> None:
-    allowed, _ = is_url_allowed("https://example.com/page?quote_id=99")
-    assert allowed is False
-
-
-def test_allow_other_query_keys() -> None:
-    allowed, _ = is_url_allowed("https://example.com/page?foo=1&bar=2")
-    assert allowed is True
-
-
 def test_fetch_url_returns_excluded_without_http() -> None:
     """Prove fetch_url returns excluded result and does NOT perform HTTP request."""
     from apps.api.services.crawl import fetch_url
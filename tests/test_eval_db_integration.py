@@ -1,15 +1,25 @@
 """Integration tests for eval metrics endpoint. No network calls."""
 
+import os
+
 import pytest
-from fastapi.testclient import TestClient
 
-from apps.api.main import app
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.schemas.eval import EvalResultCreate
 from apps.api.services.repo import create_eval_run, insert_eval_results_bulk
 from apps.api.tests.conftest import requires_db
 
-TEST_TENANT = "tenant_eval_metrics_integration"
-client = TestClient(app)
+pytestmark = pytest.mark.usefixtures("clean_eval_tables")
+
+# Per xdist worker, so parallel workers write disjoint tenants
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_TENANT = f"tenant_eval_metrics_integration_{_WORKER}"
+EVAL_TENANTS = (TEST_TENANT,)  # rows clean_eval_tables deletes
 
 
 def _make_result(
@@ -40,7 +50,7 @@ def _make_result(
 
 
 @requires_db
-def test_metrics_latest_returns_correct_rates_and_per_domain() -> None:
+def test_metrics_latest_returns_correct_rates_and_per_domain(client) -> None:
     """Create eval_run + 3 eval_results, query GET /eval/metrics/latest, assert rates and per-domain."""
     run = create_eval_run(
         TEST_TENANT,
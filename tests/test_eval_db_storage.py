@@ -4,10 +4,17 @@ Proves Step 1 complete: create, insert, query with tenant isolation.
 Uses existing test DB (DATABASE_URL); deterministic, no network.
 """
 
+import os
 from datetime import date
 
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.schemas.eval import EvalResultCreate
 from apps.api.services.repo import (
     create_eval_run,
@@ -19,9 +26,14 @@ from apps.api.services.repo import (
 )
 from apps.api.tests.conftest import requires_db
 
+pytestmark = pytest.mark.usefixtures("clean_eval_tables")
+
 
-TENANT_A = "tenant_eval_storage_a"
-TENANT_B = "tenant_eval_storage_b"
+# Per xdist worker, so parallel workers write disjoint tenants
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TENANT_A = f"tenant_eval_storage_a_{_WORKER}"
+TENANT_B = f"tenant_eval_storage_b_{_WORKER}"
+EVAL_TENANTS = (TENANT_A, TENANT_B)  # rows clean_eval_tables deletes
 
 
 def _make_result(
@@ -1,6 +1,6 @@
 """Smoke test: load tiny results.jsonl sample, verify metrics keys exist and rate values in [0,1]."""
 
-import json
+import io
 import sys
 from pathlib import Path
 
@@ -18,22 +18,15 @@ SAMPLE_JSONL = """{"query_id":"s1","tenant_id":"t1","domain":"faq","query":"q1",
 """
 
 
-@pytest.fixture
-def sample_results_path():
-    base = Path(__file__).resolve().parent / ".tmp"
-    base.mkdir(parents=True, exist_ok=True)
-    p = base / "results_metrics_smoke.jsonl"
-    p.write_text(SAMPLE_JSONL, encoding="utf-8")
-    try:
-        yield p
-    finally:
-        p.unlink(missing_ok=True)
+@pytest.fixture(scope="module")
+def sample_metrics():
+    """Sample parsed from memory (no temp file) and aggregated once; the tests below only read the dict."""
+    return _compute_metrics(_load_results(io.StringIO(SAMPLE_JSONL)))
 
 
-def test_metrics_keys_exist(sample_results_path):
+def test_metrics_keys_exist(sample_metrics):
     """Metrics output has required keys."""
-    records = _load_results(sample_results_path)
-    m = _compute_metrics(records)
+    m = sample_metrics
     required = {
         "mention_answer_rate",
         "citation_rate",
@@ -49,13 +42,39 @@ def test_metrics_keys_exist(sample_results_path):
         assert k in m, f"missing key: {k}"
 
 
-def test_rate_values_in_01(sample_results_path):
+def test_rate_values_in_01(sample_metrics):
     """Rate metrics (and CVI/100) are in [0, 1]."""
-    records = _load_results(sample_results_path)
-    m = _compute_metrics(records)
+    m = sample_metrics
     rate_keys = ["mention_answer_rate", "citation_rate", "attribution_accuracy_proxy", "hallucination_rate"]
     for k in rate_keys:
         v = m[k]
         assert 0 <= v <= 1, f"{k}={v} not in [0,1]"
     # composite_visibility_index is 0-100
     assert 0 <= m["composite_visibility_index"] <= 100
+
+
+# json.dumps writes NaN/Infinity by default; orjson rejects those tokens
+NAN_JSONL = """{"query_id":"n1","tenant_id":"t1","domain":"faq","query":"q1","refused":false,"answer":"Yes","claims":[{"text":"A","evidence_ids":["e1"],"confidence":NaN}],"citations":{"e1":{"url":"u","section_id":"s","quote_span":"x"}}}
+not-json
+{"query_id":"n2","tenant_id":"t1","domain":"pricing","query":"q2","refused":false,"answer":"No","claims":[],"citations":{},"scores":{"top":Infinity}}
+"""
+
+
+def test_nan_and_infinity_rows_are_kept():
+    """Rows carrying NaN/Infinity are parsed, not dropped as malformed."""
+    records = _load_results(io.StringIO(NAN_JSONL))
+    assert [r["query_id"] for r in records] == ["n1", "n2"]
+
+
+def test_orjson_and_json_paths_agree(monkeypatch):
+    """With orjson installed, the stdlib json path yields the same records and metrics."""
+    pytest.importorskip("orjson")
+    import eval.metrics as metrics_mod
+
+    assert metrics_mod.ORJSON_AVAILABLE
+    sample = SAMPLE_JSONL + NAN_JSONL
+    via_orjson = _load_results(io.StringIO(sample))
+    monkeypatch.setattr(metrics_mod, "ORJSON_AVAILABLE", False)
+    via_json = _load_results(io.StringIO(sample))
+    assert repr(via_json) == repr(via_orjson)  # repr: NaN != NaN under ==
+    assert repr(_compute_metrics(via_json)) == repr(_compute_metrics(via_orjson))
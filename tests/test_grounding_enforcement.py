@@ -8,11 +8,11 @@ Tests /answer with validate_answer(draft, evidence_map):
 """
 
 import json
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-from fastapi.testclient import TestClient
+import pytest
 
-from apps.api.main import app
 from apps.api.schemas.responses import (
     RetrieveCandidate,
     RetrieveDebug,
@@ -21,8 +21,6 @@ from apps.api.schemas.responses import (
     RetrieveResponse,
 )
 
-client = TestClient(app)
-
 SECTION_TEXT = "storage and moving services for relocation."
 
 
@@ -54,13 +52,31 @@ def _mock_retrieve():
     )
 
 
-@patch("apps.api.services.answer.insert_evidence")
-@patch("apps.api.services.answer.get_section_by_id", return_value={"text": SECTION_TEXT, "version_hash": "vh1"})
-@patch("apps.api.services.answer.retrieve_ac")
-@patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
-def test_missing_evidence_ids_refused(mock_retrieve, mock_section, mock_insert) -> None:
+# Built once and shared: the answer service only reads the response, so no per-call copy is needed
+_CACHED_MOCK_RETRIEVE = _mock_retrieve()
+_SECTION = {"text": SECTION_TEXT, "version_hash": "vh1"}
+
+
+@pytest.fixture
+def grounding_mocks(monkeypatch):
+    """Stub retrieval, section lookup, evidence insert and the LLM provider on the answer service (no DB).
+    Yields .llm (the get_llm_provider mock); tests set its return_value to a provider with their generate."""
+    llm = MagicMock()
+    monkeypatch.setattr("apps.api.services.answer.retrieve_ac", lambda *a, **k: _CACHED_MOCK_RETRIEVE)
+    monkeypatch.setattr("apps.api.services.answer.get_section_by_id", lambda *a, **k: dict(_SECTION))
+    monkeypatch.setattr("apps.api.services.answer.insert_evidence", lambda *a, **k: None)
+    monkeypatch.setattr("apps.api.services.answer.get_llm_provider", llm)
+    return SimpleNamespace(llm=llm)
+
+
+@pytest.fixture(autouse=True)
+def _soft_grounding_off(monkeypatch):
+    """Every test here checks strict grounding."""
+    monkeypatch.setenv("ANSWER_SOFT_GROUNDING", "false")
+
+
+def test_missing_evidence_ids_refused(grounding_mocks, client) -> None:
     """missing evidence_ids => refused."""
-    mock_retrieve.return_value = _mock_retrieve()
 
     def fake_llm(prompt, evidence_items):
         return json.dumps({
@@ -68,9 +84,8 @@ def test_missing_evidence_ids_refused(mock_retrieve, mock_section, mock_insert)
             "claims": [{"text": "Unsupported claim without evidence.", "evidence_ids": [], "confidence": 0.9}],
         })
 
-    with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
-        resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
+    grounding_mocks.llm.return_value = SimpleNamespace(generate=fake_llm)
+    resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
     data = resp.json()
@@ -80,13 +95,8 @@ def test_missing_evidence_ids_refused(mock_retrieve, mock_section, mock_insert)
     assert len(data["claims"]) == 0
 
 
-@patch("apps.api.services.answer.insert_evidence")
-@patch("apps.api.services.answer.get_section_by_id", return_value={"text": SECTION_TEXT, "version_hash": "vh1"})
-@patch("apps.api.services.answer.retrieve_ac")
-@patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
-def test_unknown_evidence_id_refused(mock_retrieve, mock_section, mock_insert) -> None:
+def test_unknown_evidence_id_refused(grounding_mocks, client) -> None:
     """unknown evidence_id => refused."""
-    mock_retrieve.return_value = _mock_retrieve()
 
     def fake_llm(prompt, evidence_items):
         return json.dumps({
@@ -94,9 +104,8 @@ def test_unknown_evidence_id_refused(mock_retrieve, mock_section, mock_insert) -
             "claims": [{"text": "Invented citation claim.", "evidence_ids": ["nonexistent-evid-123"], "confidence": 0.9}],
         })
 
-    with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
-        resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
+    grounding_mocks.llm.return_value = SimpleNamespace(generate=fake_llm)
+    resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
     data = resp.json()
@@ -106,13 +115,9 @@ def test_unknown_evidence_id_refused(mock_retrieve, mock_section, mock_insert) -
     assert len(data["claims"]) == 0
 
 
-@patch("apps.api.services.answer.insert_evidence")
-@patch("apps.api.services.answer.get_section_by_id", return_value={"text": SECTION_TEXT, "version_hash": "vh1"})
-@patch("apps.api.services.answer.retrieve_ac")
-@patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false", "GROUNDING_MIN_OVERLAP": "0.3"})
-def test_non_overlapping_claim_refused(mock_retrieve, mock_section, mock_insert) -> None:
+def test_non_overlapping_claim_refused(grounding_mocks, client, monkeypatch) -> None:
     """non-overlapping claim => refused."""
-    mock_retrieve.return_value = _mock_retrieve()
+    monkeypatch.setenv("GROUNDING_MIN_OVERLAP", "0.3")
 
     def fake_llm(prompt, evidence_items):
         eids = [e["evidence_id"] for e in evidence_items]
@@ -123,9 +128,8 @@ def test_non_overlapping_claim_refused(mock_retrieve, mock_section, mock_insert)
             ],
         })
 
-    with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
-        resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
+    grounding_mocks.llm.return_value = SimpleNamespace(generate=fake_llm)
+    resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
     data = resp.json()
@@ -135,13 +139,8 @@ def test_non_overlapping_claim_refused(mock_retrieve, mock_section, mock_insert)
     assert len(data["claims"]) == 0
 
 
-@patch("apps.api.services.answer.insert_evidence")
-@patch("apps.api.services.answer.get_section_by_id", return_value={"text": SECTION_TEXT, "version_hash": "vh1"})
-@patch("apps.api.services.answer.retrieve_ac")
-@patch.dict("os.environ", {"ANSWER_SOFT_GROUNDING": "false"})
-def test_valid_overlapping_claim_allowed(mock_retrieve, mock_section, mock_insert) -> None:
+def test_valid_overlapping_claim_allowed(grounding_mocks, client) -> None:
     """valid overlapping claim => allowed."""
-    mock_retrieve.return_value = _mock_retrieve()
 
     def fake_llm(prompt, evidence_items):
         eids = [e["evidence_id"] for e in evidence_items]
@@ -152,9 +151,8 @@ def test_valid_overlapping_claim_allowed(mock_retrieve, mock_section, mock_inser
             ],
         })
 
-    with patch("apps.api.services.answer.get_llm_provider") as mock_llm:
-        mock_llm.return_value = MagicMock(generate=fake_llm)
-        resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
+    grounding_mocks.llm.return_value = SimpleNamespace(generate=fake_llm)
+    resp = client.post("/answer", json={"query": "moving"}, headers={"Authorization": "Bearer tenant:t"})
 
     assert resp.status_code == 200
     data = resp.json()
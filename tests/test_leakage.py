@@ -3,27 +3,33 @@
 Uses TestClient; ENV=test gives deterministic embeddings (no external calls).
 """
 
+import uuid
+
 import pytest
-from fastapi.testclient import TestClient
 
-from apps.api.main import app
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.index_ac import index_ac
 from apps.api.services.repo import get_sections_by_raw_page_id, insert_raw_page, insert_sections
 from apps.api.tests.conftest import requires_db
 
-# Tenants and unique content
-TENANT_A = "tenant_leakage_a"
-TENANT_B = "tenant_leakage_b"
+# Tenants and unique content; per-run suffix so module-scoped rows never collide with a previous run
+_RUN = uuid.uuid4().hex[:8]
+TENANT_A = f"tenant_leakage_a_{_RUN}"
+TENANT_B = f"tenant_leakage_b_{_RUN}"
 URL_A = "https://a.example.com/doc"
 URL_B = "https://b.example.com/doc"
 ALPHA_PHRASE = "alpha_only_phrase_9f3k"
-SECTION_A_ID = "sec_leak_a_1"
-SECTION_B_ID = "sec_leak_b_1"
-
-client = TestClient(app)
+SECTION_A_ID = f"sec_leak_a_1_{_RUN}"
+SECTION_B_ID = f"sec_leak_b_1_{_RUN}"
+HDR_B = {"Authorization": f"Bearer tenant:{TENANT_B}"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tenant_a_data():
     """Insert raw_page + section for tenant_a containing unique phrase."""
     pid = insert_raw_page(TENANT_A, URL_A, text=f"Content with {ALPHA_PHRASE} for tenant A only.")
@@ -35,7 +41,7 @@ def tenant_a_data():
     yield {"pid": pid}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tenant_b_data():
     """Insert raw_page + section for tenant_b with unrelated content."""
     pid = insert_raw_page(TENANT_B, URL_B, text="Unrelated content for tenant B.")
@@ -47,9 +53,9 @@ def tenant_b_data():
     yield {"pid": pid}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def indexed_both_tenants(tenant_a_data, tenant_b_data):
-    """Both tenants have AC embeddings indexed. Deterministic (ENV=test)."""
+    """Both tenants have AC embeddings indexed once per module. Deterministic (ENV=test); tests only read."""
     pid_a = tenant_a_data["pid"]
     pid_b = tenant_b_data["pid"]
     sections_a = get_sections_by_raw_page_id(TENANT_A, pid_a)
@@ -64,12 +70,12 @@ def indexed_both_tenants(tenant_a_data, tenant_b_data):
 
 
 @requires_db
-def test_cross_tenant_retrieval_returns_zero_results(indexed_both_tenants) -> None:
+def test_cross_tenant_retrieval_returns_zero_results(indexed_both_tenants, client) -> None:
     """Tenant B querying tenant A's unique phrase returns zero results (no cross-tenant leakage)."""
     resp = client.post(
         "/retrieve/ac",
         json={"query": ALPHA_PHRASE, "k": 20},
-        headers={"Authorization": f"Bearer tenant:{TENANT_B}"},
+        headers=HDR_B,
     )
     assert resp.status_code == 200
     data = resp.json()
@@ -1,43 +1,52 @@
 """Smoke test: FTS migration (text_tsv, GIN index) applied correctly."""
 
 import pytest
+
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from sqlalchemy import text
 
 from apps.api.db import engine
 from apps.api.tests.conftest import requires_db
 
 
-@requires_db
-def test_text_tsv_column_exists() -> None:
-    """Migration 001: sections.text_tsv column exists."""
+@pytest.fixture(scope="module")
+def fts_schema_info():
+    """(text_tsv data_type or None, GIN index present) from one catalog round-trip."""
     with engine.connect() as conn:
         row = conn.execute(
             text(
                 """
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = 'sections' AND column_name = 'text_tsv'
+            SELECT
+                (SELECT data_type
+                 FROM information_schema.columns
+                 WHERE table_name = 'sections' AND column_name = 'text_tsv') AS tsv_type,
+                EXISTS (SELECT 1
+                        FROM pg_indexes
+                        WHERE tablename = 'sections' AND indexname = 'ix_sections_text_tsv') AS has_gin
             """
             )
-        ).fetchone()
-    assert row is not None, "sections.text_tsv column should exist"
-    assert row[1] == "tsvector"
+        ).one()
+    return row.tsv_type, row.has_gin
 
 
 @requires_db
-def test_text_tsv_gin_index_exists() -> None:
+def test_text_tsv_column_exists(fts_schema_info) -> None:
+    """Migration 001: sections.text_tsv column exists."""
+    tsv_type, _ = fts_schema_info
+    assert tsv_type is not None, "sections.text_tsv column should exist"
+    assert tsv_type == "tsvector"
+
+
+@requires_db
+def test_text_tsv_gin_index_exists(fts_schema_info) -> None:
     """Migration 001: GIN index on text_tsv exists."""
-    with engine.connect() as conn:
-        row = conn.execute(
-            text(
-                """
-            SELECT indexname
-            FROM pg_indexes
-            WHERE tablename = 'sections' AND indexname = 'ix_sections_text_tsv'
-            """
-            )
-        ).fetchone()
-    assert row is not None, "ix_sections_text_tsv GIN index should exist"
+    _, has_gin = fts_schema_info
+    assert has_gin, "ix_sections_text_tsv GIN index should exist"
 
 
 @requires_db
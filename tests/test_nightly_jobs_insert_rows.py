@@ -3,17 +3,33 @@
 Monkeypatches API calls; no real network. Requires Postgres.
 """
 
+import os
+
 import pytest
 
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.repo import (
     get_eval_results,
     list_eval_runs,
     list_monitor_events,
 )
 from apps.api.tests.conftest import requires_db
+from cron.eval_nightly import main as eval_main
+from cron.leakage_nightly import main as leakage_main
+
+# Per xdist worker, so parallel workers write disjoint tenants
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TENANT_EVAL = f"tenant_nightly_eval_{_WORKER}"
+TENANT_LEAK = f"tenant_nightly_leak_{_WORKER}"
+TENANT_LEAK_FAIL = f"tenant_nightly_leak_fail_{_WORKER}"
+EVAL_TENANTS = (TENANT_EVAL, TENANT_LEAK, TENANT_LEAK_FAIL)  # rows clean_eval_tables deletes
 
-TENANT_EVAL = "tenant_nightly_eval"
-TENANT_LEAK = "tenant_nightly_leak"
+pytestmark = pytest.mark.usefixtures("clean_eval_tables")
 
 
 def _mock_answer_ok(row: dict) -> dict:
@@ -49,9 +65,7 @@ def test_eval_nightly_inserts_eval_run_and_results(monkeypatch) -> None:
     monkeypatch.setattr("cron.eval_nightly._load_queries", mock_load_queries)
     monkeypatch.setattr("cron.eval_nightly._call_answer", mock_call_answer)
 
-    from cron.eval_nightly import main
-
-    exit_code = main()
+    exit_code = eval_main()
     assert exit_code == 0
 
     runs = list_eval_runs(TENANT_EVAL, limit=5)
@@ -79,9 +93,7 @@ def test_leakage_nightly_pass_inserts_monitor_event(monkeypatch) -> None:
     monkeypatch.setattr("cron.leakage_nightly._load_foreign_queries", mock_load_foreign)
     monkeypatch.setattr("cron.leakage_nightly._call_retrieve_ac", mock_retrieve_ac)
 
-    from cron.leakage_nightly import main
-
-    exit_code = main()
+    exit_code = leakage_main()
     assert exit_code == 0
 
     events = list_monitor_events(TENANT_LEAK, event_type="leakage_pass", limit=1)
@@ -94,26 +106,23 @@ def test_leakage_nightly_pass_inserts_monitor_event(monkeypatch) -> None:
 @requires_db
 def test_leakage_nightly_fail_inserts_monitor_event(monkeypatch) -> None:
     """Run leakage_nightly with mocked retrieve returning candidates; assert leakage_fail inserted."""
-    tenant_fail = "tenant_nightly_leak_fail"
 
     def mock_load_foreign(tenant_id: str):
-        if tenant_id == tenant_fail:
+        if tenant_id == TENANT_LEAK_FAIL:
             return [{"query_id": "qf1", "query": "foreign Q", "tenant_id": "other"}]
         return []
 
     def mock_retrieve_ac(*_args, **_kwargs):
         return ([{"section_id": "s1", "url": "https://x.com"}], True)
 
-    monkeypatch.setattr("cron.config.config", "TENANTS", [tenant_fail])
+    monkeypatch.setattr("cron.config.config", "TENANTS", [TENANT_LEAK_FAIL])
     monkeypatch.setattr("cron.leakage_nightly._load_foreign_queries", mock_load_foreign)
     monkeypatch.setattr("cron.leakage_nightly._call_retrieve_ac", mock_retrieve_ac)
 
-    from cron.leakage_nightly import main
-
-    exit_code = main()
+    exit_code = leakage_main()
     assert exit_code == 1
 
-    events = list_monitor_events(tenant_fail, event_type="leakage_fail", limit=1)
+    events = list_monitor_events(TENANT_LEAK_FAIL, event_type="leakage_fail", limit=1)
     assert len(events) >= 1
     assert events[0].event_type == "leakage_fail"
     assert events[0].severity == "high"
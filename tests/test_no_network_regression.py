@@ -10,6 +10,17 @@ import time
 import pytest
 
 
+@pytest.fixture
+def block_network(monkeypatch):
+    """Any outbound connect() during the test raises (socket class patched once, not per instance)."""
+
+    def _blocked(self, addr):
+        raise RuntimeError("Outbound network blocked in tests. EMBED_PROVIDER must be 'deterministic'.")
+
+    monkeypatch.setattr(socket.socket, "connect", _blocked)
+    monkeypatch.setattr(socket.socket, "connect_ex", _blocked)
+
+
 def test_embed_provider_must_be_deterministic() -> None:
     """EMBED_PROVIDER must be 'deterministic' during tests to avoid network/model downloads."""
     assert os.getenv("EMBED_PROVIDER") == "deterministic", (
@@ -20,9 +31,7 @@ def test_embed_provider_must_be_deterministic() -> None:
 
 def test_embed_text_fast_and_deterministic() -> None:
     """embed_text returns quickly and deterministically (no model load, no network)."""
-    from apps.api.services.embedding_provider import EMBEDDING_DIM, embed_text, get_embedding_provider
-
-    get_embedding_provider(force_refresh=True)
+    from apps.api.services.embedding_provider import EMBEDDING_DIM, embed_text
 
     t0 = time.perf_counter()
     v1 = embed_text("hello")
@@ -37,30 +46,12 @@ def test_embed_text_fast_and_deterministic() -> None:
     assert elapsed < 0.5, f"embed_text must be fast (<0.5s), took {elapsed:.3f}s (indicates model load/network)"
 
 
-def test_no_outbound_network_on_embed(monkeypatch) -> None:
+def test_no_outbound_network_on_embed(monkeypatch, block_network) -> None:
     """Block network; embed_text must still succeed (deterministic provider uses no network)."""
-    from apps.api.services.embedding_provider import embed_text, get_embedding_provider
+    from apps.api.services.embedding_provider import embed_text
 
     monkeypatch.setenv("EMBED_PROVIDER", "deterministic")
     monkeypatch.setenv("ENV", "test")
-    get_embedding_provider(force_refresh=True)
-
-    _original_socket = socket.socket
-
-    def _blocking_socket(family=-1, type=-1, proto=-1, fileno=None):
-        s = _original_socket(family, type, proto, fileno)
-
-        _orig_connect = s.connect
-
-        def _blocked_connect(addr):
-            raise RuntimeError(
-                "Outbound network blocked in tests. EMBED_PROVIDER must be 'deterministic'."
-            )
-
-        s.connect = _blocked_connect
-        return s
-
-    monkeypatch.setattr("socket.socket", _blocking_socket)
 
     v = embed_text("no network needed")
     assert len(v) == 384
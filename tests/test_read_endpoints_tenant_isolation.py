@@ -2,25 +2,51 @@
 
 Create eval data for tenant A and B, call endpoints with auth tenant A => sees A only.
 Call with tenant B => sees B only. No cross-tenant leakage.
-Uses mock auth (Authorization: Bearer tenant:<id>) as in existing fixtures.
+Uses mock auth (Authorization: Bearer tenant:<id>) as in existing fixtures; A and B requests run concurrently.
 """
 
+import asyncio
+import os
+from typing import Any
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
 
-from apps.api.main import app
+from tests._db_bootstrap import delete_eval_rows_for_tenants
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.schemas.eval import EvalResultCreate
-from apps.api.services.repo import (
-    create_eval_run,
-    create_monitor_event,
-    insert_eval_results_bulk,
-)
+from apps.api.services.repo import create_eval_run_with_results, create_monitor_event
 from apps.api.tests.conftest import requires_db
 
-TENANT_A = "tenant_read_iso_a"
-TENANT_B = "tenant_read_iso_b"
-
-client = TestClient(app)
+# Per xdist worker, so parallel workers seed and read disjoint tenants
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TENANT_A = f"tenant_read_iso_a_{_WORKER}"
+TENANT_B = f"tenant_read_iso_b_{_WORKER}"
+HDR_A = {"Authorization": f"Bearer tenant:{TENANT_A}"}
+HDR_B = {"Authorization": f"Bearer tenant:{TENANT_B}"}
+
+
+# Validated once; _make_result only swaps the per-row fields via model_copy (no re-validation)
+_RESULT_TEMPLATE = EvalResultCreate(
+    query_id="_",
+    domain="_",
+    query_text="_",
+    refused=False,
+    refusal_reason=None,
+    mention_ok=True,
+    citation_ok=True,
+    attribution_ok=True,
+    hallucination_flag=False,
+    evidence_count=1,
+    avg_confidence=0.9,
+    top_cited_urls=None,
+    answer_preview="preview",
+)
 
 
 def _make_result(
@@ -30,161 +56,97 @@ def _make_result(
     *,
     refused: bool = False,
 ) -> EvalResultCreate:
-    return EvalResultCreate(
-        query_id=query_id,
-        domain=domain,
-        query_text=query_text,
-        refused=refused,
-        refusal_reason=None,
-        mention_ok=True,
-        citation_ok=True,
-        attribution_ok=True,
-        hallucination_flag=False,
-        evidence_count=1,
-        avg_confidence=0.9,
-        top_cited_urls=None,
-        answer_preview="preview",
+    return _RESULT_TEMPLATE.model_copy(
+        update={"query_id": query_id, "domain": domain, "query_text": query_text, "refused": refused}
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def eval_data_both_tenants():
-    """Create eval runs + results for tenant A and B. Returns run ids."""
-    run_a = create_eval_run(
+    """Create eval runs + results for tenant A and B once per module (tests only read). Yields run ids;
+    deletes both tenants' eval rows before seeding and after the module."""
+    delete_eval_rows_for_tenants([TENANT_A, TENANT_B])
+    # One transaction per tenant for the run and its results
+    run_a = create_eval_run_with_results(
         TENANT_A,
         crawl_policy_version="p1",
         ac_version_hash="ac1",
         ec_version_hash="ec1",
-        git_sha=None,
+        results=[_make_result("q_a1", "dom_a", "Query A1"), _make_result("q_a2", "dom_a", "Query A2")],
     )
-    run_b = create_eval_run(
+    run_b = create_eval_run_with_results(
         TENANT_B,
         crawl_policy_version="p1",
         ac_version_hash="ac1",
         ec_version_hash="ec1",
-        git_sha=None,
-    )
-    insert_eval_results_bulk(
-        TENANT_A,
-        run_a.id,
-        [_make_result("q_a1", "dom_a", "Query A1"), _make_result("q_a2", "dom_a", "Query A2")],
-    )
-    insert_eval_results_bulk(
-        TENANT_B,
-        run_b.id,
-        [_make_result("q_b1", "dom_b", "Query B1")],
+        results=[_make_result("q_b1", "dom_b", "Query B1")],
     )
     create_monitor_event(TENANT_A, event_type="leakage_fail", severity="high", details_json={"reason": "A fail"})
     create_monitor_event(TENANT_B, event_type="leakage_fail", severity="medium", details_json={"reason": "B fail"})
-    return {"run_a_id": run_a.id, "run_b_id": run_b.id}
-
-
-@requires_db
-def test_eval_runs_tenant_a_sees_only_a(eval_data_both_tenants) -> None:
-    """Tenant A auth => /eval/runs returns only A's runs."""
-    resp = client.get("/eval/runs", headers={"Authorization": f"Bearer tenant:{TENANT_A}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_A
-    run_ids = [r["run_id"] for r in data["runs"]]
-    assert str(eval_data_both_tenants["run_a_id"]) in run_ids
-    assert str(eval_data_both_tenants["run_b_id"]) not in run_ids
+    yield {"run_a_id": run_a.id, "run_b_id": run_b.id}
+    # Teardown scoped to this module's (worker-suffixed) tenants; no schema reset needed
+    delete_eval_rows_for_tenants([TENANT_A, TENANT_B])
 
 
-@requires_db
-def test_eval_runs_tenant_b_sees_only_b(eval_data_both_tenants) -> None:
-    """Tenant B auth => /eval/runs returns only B's runs."""
-    resp = client.get("/eval/runs", headers={"Authorization": f"Bearer tenant:{TENANT_B}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_B
-    run_ids = [r["run_id"] for r in data["runs"]]
-    assert str(eval_data_both_tenants["run_b_id"]) in run_ids
-    assert str(eval_data_both_tenants["run_a_id"]) not in run_ids
+async def _get_both(ac: httpx.AsyncClient, path: str) -> tuple[Any, Any]:
+    """GET path as tenant A and tenant B concurrently; returns (A json, B json)."""
+    resp_a, resp_b = await asyncio.gather(ac.get(path, headers=HDR_A), ac.get(path, headers=HDR_B))
+    assert resp_a.status_code == 200
+    assert resp_b.status_code == 200
+    return resp_a.json(), resp_b.json()
 
 
 @requires_db
-def test_eval_results_tenant_a_sees_a_results(eval_data_both_tenants) -> None:
-    """Tenant A auth => /eval/runs/{run_a_id}/results returns A's results."""
-    run_a_id = eval_data_both_tenants["run_a_id"]
-    resp = client.get(
-        f"/eval/runs/{run_a_id}/results",
-        headers={"Authorization": f"Bearer tenant:{TENANT_A}"},
-    )
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_A
-    assert len(data["results"]) == 2
-    assert all(r["domain"] == "dom_a" for r in data["results"])
+@pytest.mark.anyio
+async def test_eval_runs_tenant_sees_only_own(eval_data_both_tenants, async_client) -> None:
+    """/eval/runs returns only the caller's runs."""
+    run_a, run_b = str(eval_data_both_tenants["run_a_id"]), str(eval_data_both_tenants["run_b_id"])
+    data_a, data_b = await _get_both(async_client, "/eval/runs")
+    assert data_a["tenant_id"] == TENANT_A
+    assert data_b["tenant_id"] == TENANT_B
+    ids_a = [r["run_id"] for r in data_a["runs"]]
+    ids_b = [r["run_id"] for r in data_b["runs"]]
+    assert run_a in ids_a and run_b not in ids_a
+    assert run_b in ids_b and run_a not in ids_b
 
 
 @requires_db
-def test_eval_results_tenant_b_cannot_see_a_results(eval_data_both_tenants) -> None:
-    """Tenant B auth => /eval/runs/{run_a_id}/results returns empty (no cross-leak)."""
+@pytest.mark.anyio
+async def test_eval_results_of_run_a_scoped_to_tenant(eval_data_both_tenants, async_client) -> None:
+    """/eval/runs/{run_a_id}/results returns A's results to A and nothing to B (no cross-leak)."""
     run_a_id = eval_data_both_tenants["run_a_id"]
-    resp = client.get(
-        f"/eval/runs/{run_a_id}/results",
-        headers={"Authorization": f"Bearer tenant:{TENANT_B}"},
-    )
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_B
-    assert len(data["results"]) == 0
-
-
-@requires_db
-def test_eval_metrics_latest_tenant_a(eval_data_both_tenants) -> None:
-    """Tenant A auth => /eval/metrics/latest returns A's metrics."""
-    resp = client.get("/eval/metrics/latest", headers={"Authorization": f"Bearer tenant:{TENANT_A}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["run_id"] == str(eval_data_both_tenants["run_a_id"])
-
-
-@requires_db
-def test_eval_metrics_latest_tenant_b(eval_data_both_tenants) -> None:
-    """Tenant B auth => /eval/metrics/latest returns B's metrics."""
-    resp = client.get("/eval/metrics/latest", headers={"Authorization": f"Bearer tenant:{TENANT_B}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["run_id"] == str(eval_data_both_tenants["run_b_id"])
-
-
-@requires_db
-def test_monitor_events_tenant_a_sees_only_a(eval_data_both_tenants) -> None:
-    """Tenant A auth => /monitor/events returns only A's events."""
-    resp = client.get("/monitor/events", headers={"Authorization": f"Bearer tenant:{TENANT_A}"})
-    assert resp.status_code == 200
-    events = resp.json()
-    assert all(e["tenant_id"] == TENANT_A for e in events)
+    data_a, data_b = await _get_both(async_client, f"/eval/runs/{run_a_id}/results")
+    assert data_a["tenant_id"] == TENANT_A
+    assert data_b["tenant_id"] == TENANT_B
+    assert len(data_a["results"]) == 2
+    assert all(r["domain"] == "dom_a" for r in data_a["results"])
+    assert data_b["results"] == []
 
 
 @requires_db
-def test_monitor_events_tenant_b_sees_only_b(eval_data_both_tenants) -> None:
-    """Tenant B auth => /monitor/events returns only B's events."""
-    resp = client.get("/monitor/events", headers={"Authorization": f"Bearer tenant:{TENANT_B}"})
-    assert resp.status_code == 200
-    events = resp.json()
-    assert all(e["tenant_id"] == TENANT_B for e in events)
+@pytest.mark.anyio
+async def test_eval_metrics_latest_uses_own_run(eval_data_both_tenants, async_client) -> None:
+    """/eval/metrics/latest reports the caller's latest run."""
+    data_a, data_b = await _get_both(async_client, "/eval/metrics/latest")
+    assert data_a["run_id"] == str(eval_data_both_tenants["run_a_id"])
+    assert data_b["run_id"] == str(eval_data_both_tenants["run_b_id"])
 
 
 @requires_db
-def test_monitor_leakage_latest_tenant_a(eval_data_both_tenants) -> None:
-    """Tenant A auth => /monitor/leakage/latest returns A's leakage status."""
-    resp = client.get("/monitor/leakage/latest", headers={"Authorization": f"Bearer tenant:{TENANT_A}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_A
-    assert data["ok"] is False
-    assert data["details_json"] == {"reason": "A fail"}
+@pytest.mark.anyio
+async def test_monitor_events_tenant_sees_only_own(eval_data_both_tenants, async_client) -> None:
+    """/monitor/events returns only the caller's events."""
+    events_a, events_b = await _get_both(async_client, "/monitor/events")
+    assert all(e["tenant_id"] == TENANT_A for e in events_a)
+    assert all(e["tenant_id"] == TENANT_B for e in events_b)
 
 
 @requires_db
-def test_monitor_leakage_latest_tenant_b(eval_data_both_tenants) -> None:
-    """Tenant B auth => /monitor/leakage/latest returns B's leakage status."""
-    resp = client.get("/monitor/leakage/latest", headers={"Authorization": f"Bearer tenant:{TENANT_B}"})
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["tenant_id"] == TENANT_B
-    assert data["ok"] is False
-    assert data["details_json"] == {"reason": "B fail"}
+@pytest.mark.anyio
+async def test_monitor_leakage_latest_is_own(eval_data_both_tenants, async_client) -> None:
+    """/monitor/leakage/latest returns the caller's leakage status."""
+    data_a, data_b = await _get_both(async_client, "/monitor/leakage/latest")
+    for data, tenant_id, reason in ((data_a, TENANT_A, "A fail"), (data_b, TENANT_B, "B fail")):
+        assert data["tenant_id"] == tenant_id
+        assert data["ok"] is False
+        assert data["details_json"] == {"reason": reason}
@@ -11,41 +11,39 @@ from apps.api.services.repo import (
     insert_raw_page,
     insert_sections,
 )
+from apps.api.services.embedding_provider import EMBEDDING_DIM, vector_literal
 from apps.api.services.tenant_guard import require_tenant_id, tenant_where
 
-
-def test_repo_raises_on_none_or_empty_tenant() -> None:
-    """Representative functions raise TenantRequiredError for None and empty tenant_id."""
-    with pytest.raises(TenantRequiredError):
-        get_sections_by_query(None, "q", 10)
-    with pytest.raises(TenantRequiredError):
-        get_sections_by_query("", "q", 10)
-    with pytest.raises(TenantRequiredError):
-        insert_raw_page(None, "http://x.com")
-
-
-def test_retrieval_functions_raise_on_missing_tenant() -> None:
-    """AC retrieval and evidence lookup raise before DB when tenant_id missing."""
-    emb = "[" + ",".join("0.0" for _ in range(384)) + "]"  # valid pgvector dim
-    with pytest.raises(TenantRequiredError):
-        execute_ac_retrieval(None, emb, 5)
-    with pytest.raises(TenantRequiredError):
-        get_evidence_by_ids("", ["e1"])
-
-
-def test_insert_raw_page_raises_on_empty_tenant() -> None:
-    with pytest.raises(TenantRequiredError):
-        insert_raw_page("", "http://example.com")
-
-
-def test_insert_sections_raises_on_none_tenant() -> None:
-    with pytest.raises(TenantRequiredError):
-        insert_sections(None, 1, [{"section_id": "s1", "text": "x"}])
-
-
-def test_insert_evidence_raises_on_whitespace_tenant() -> None:
+_EMB_LITERAL = vector_literal([0.0] * EMBEDDING_DIM)  # valid pgvector dim
+
+
+@pytest.mark.parametrize(
+    "fn,args",
+    [
+        (get_sections_by_query, (None, "q", 10)),
+        (get_sections_by_query, ("", "q", 10)),
+        (insert_raw_page, (None, "http://x.com")),
+        (insert_raw_page, ("", "http://example.com")),
+        (insert_sections, (None, 1, [{"section_id": "s1", "text": "x"}])),
+        (insert_evidence, ("   ", [{"evidence_id": "e1", "section_id": "s1"}])),
+        (execute_ac_retrieval, (None, _EMB_LITERAL, 5)),
+        (get_evidence_by_ids, ("", ["e1"])),
+    ],
+    ids=[
+        "get_sections_by_query-none",
+        "get_sections_by_query-empty",
+        "insert_raw_page-none",
+        "insert_raw_page-empty",
+        "insert_sections-none",
+        "insert_evidence-whitespace",
+        "execute_ac_retrieval-none",
+        "get_evidence_by_ids-empty",
+    ],
+)
+def test_repo_raises_on_missing_tenant(fn, args) -> None:
+    """Repo entry points raise TenantRequiredError for None/empty/whitespace tenant_id, before any DB access."""
     with pytest.raises(TenantRequiredError):
-        insert_evidence("   ", [{"evidence_id": "e1", "section_id": "s1"}])
+        fn(*args)
 
 
 def test_require_tenant_id_raises_immediately_no_db() -> None:
@@ -12,9 +12,8 @@ def test_repo_public_functions_start_with_tenant_id() -> None:
             continue
         if getattr(obj, "__module__", "") != repo.__name__:
             continue  # skip imports (e.g. get_db)
-        sig = inspect.signature(obj)
-        params = list(sig.parameters)
-        assert len(params) >= 1, f"repo.{name} has no parameters"
-        assert params[0] == "tenant_id", (
-            f"repo.{name} first param must be 'tenant_id', got {params[0]!r}"
-        )
+        # Read the first positional name off the code object: no Signature build, no annotation handling
+        code = inspect.unwrap(obj).__code__
+        assert code.co_argcount >= 1, f"repo.{name} has no positional parameters"
+        first = code.co_varnames[0]
+        assert first == "tenant_id", f"repo.{name} first param must be 'tenant_id', got {first!r}"
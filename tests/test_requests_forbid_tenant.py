@@ -5,6 +5,10 @@ from pydantic import ValidationError
 
 from apps.api.schemas.requests import AnswerRequest, RetrieveRequest
 
+# Validated once and shared: request models are frozen, so no test can mutate them
+_VALID_RETRIEVE = RetrieveRequest(query="q", k=5)
+_VALID_ANSWER = AnswerRequest(query="q")
+
 
 def test_retrieve_request_rejects_tenant_id() -> None:
     with pytest.raises(ValidationError):
@@ -21,12 +25,17 @@ def test_answer_request_rejects_tenant_id() -> None:
         AnswerRequest(query="q", tenant_id="t1")
 
 
+def test_retrieve_request_is_strict_and_frozen() -> None:
+    with pytest.raises(ValidationError):
+        RetrieveRequest.model_validate({"query": "q", "k": "10"})
+    with pytest.raises(ValidationError):
+        _VALID_RETRIEVE.k = 6
+
+
 def test_retrieve_request_accepts_valid_payload() -> None:
-    r = RetrieveRequest(query="q", k=5)
-    assert r.query == "q"
-    assert r.k == 5
+    assert _VALID_RETRIEVE.query == "q"
+    assert _VALID_RETRIEVE.k == 5
 
 
 def test_answer_request_accepts_valid_payload() -> None:
-    r = AnswerRequest(query="q")
-    assert r.query == "q"
+    assert _VALID_ANSWER.query == "q"
@@ -1,29 +1,38 @@
 """Deterministic tests: /retrieve/ec is vector-only (no ILIKE fallback). Tenant isolation."""
 
 import pytest
-from fastapi.testclient import TestClient
 
-from apps.api.main import app
+from tests.conftest import _db_available_for_tests
+
+# Every test here needs the DB: skip the module before importing the app/services
+if not _db_available_for_tests():
+    pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable", allow_module_level=True)
+
 from apps.api.services.index_ec import build_ec
 from apps.api.services.repo import insert_raw_page, insert_sections
 from apps.api.tests.conftest import requires_db
 
-client = TestClient(app)
+# Both tests share TENANT_A's index, which build_ec rewrites: keep them on one worker under --dist loadgroup
+pytestmark = pytest.mark.xdist_group("ec_vector")
 
 TENANT_A = "tenant_ec_vector_a"
 TENANT_B = "tenant_ec_vector_b"
+HEADERS_A = {"Authorization": f"Bearer tenant:{TENANT_A}"}
+HEADERS_B = {"Authorization": f"Bearer tenant:{TENANT_B}"}
 ENTITY_PHRASE = "Coastal Moving Corp"
 QUERY = "Coastal Moving"
+# Shared zero vector: build_ec only reads the embeddings it gets back
+_ZERO_EMB = [0.0] * 384
 
 
 def _mock_embed(texts: list[str]) -> list[list[float]]:
     """Deterministic mock: no network."""
-    return [[0.0] * 384 for _ in texts]
+    return [_ZERO_EMB] * len(texts)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tenant_a_indexed():
-    """Tenant A with sections containing ENTITY_PHRASE, EC indexed."""
+    """Tenant A with sections containing ENTITY_PHRASE, EC indexed once per module (tests only read)."""
     url = "https://example.com/coastal"
     pid = insert_raw_page(TENANT_A, url, text="Moving services")
     insert_sections(TENANT_A, pid, [
@@ -34,12 +43,12 @@ def tenant_a_indexed():
 
 
 @requires_db
-def test_tenant_a_indexed_query_returns_entity(tenant_a_indexed) -> None:
+def test_tenant_a_indexed_query_returns_entity(tenant_a_indexed, client) -> None:
     """Tenant A indexed => query returns at least one entity (vector-only)."""
     resp = client.post(
         "/retrieve/ec",
         json={"query": QUERY, "k": 10, "n": 5},
-        headers={"Authorization": f"Bearer tenant:{TENANT_A}"},
+        headers=HEADERS_A,
     )
     assert resp.status_code == 200
     data = resp.json()
@@ -60,12 +69,12 @@ def test_tenant_a_indexed_query_returns_entity(tenant_a_indexed) -> None:
 
 
 @requires_db
-def test_tenant_b_same_query_zero_results(tenant_a_indexed) -> None:
+def test_tenant_b_same_query_zero_results(tenant_a_indexed, client) -> None:
     """Tenant B same query => 0 results (tenant isolation, no cross-tenant data)."""
     resp = client.post(
         "/retrieve/ec",
         json={"query": QUERY, "k": 10},
-        headers={"Authorization": f"Bearer tenant:{TENANT_B}"},
+        headers=HEADERS_B,
     )
     assert resp.status_code == 200
     data = resp.json()
@@ -1,24 +1,38 @@
-"""Regression: schema reset + create is idempotent (no DuplicateTable when run twice)."""
+"""Regression: schema reset + create is idempotent (no DuplicateTable when run twice, same schema after)."""
 
 import os
 
 import pytest
 
-from tests._db_bootstrap import postgres_reachable, run_test_db_schema_fixture
+from tests._db_bootstrap import public_schema_snapshot, run_test_db_schema_fixture
+from tests.conftest import requires_db
 
-
-def _db_available() -> bool:
-    url = os.environ.get("DATABASE_TEST_URL")
-    if not url:
-        return False
-    return postgres_reachable(url)
+# Drops and recreates the shared public schema mid-run: under xdist that would pull it out from
+# under the other workers, whatever their group, so these only run in a single-process session
+pytestmark = pytest.mark.skipif(
+    bool(os.environ.get("PYTEST_XDIST_WORKER")), reason="resets the shared test schema; run without -n"
+)
 
 
+@requires_db
 def test_schema_setup_idempotent():
-    """Run schema reset + create twice; assert no exception (no DuplicateTable)."""
-    if not _db_available():
-        pytest.skip("DATABASE_TEST_URL not set or Postgres not reachable")
-
+    """Run schema reset + create twice; assert no exception and an identical public schema both times."""
     run_test_db_schema_fixture()
+    relations1, columns1 = public_schema_snapshot()
     run_test_db_schema_fixture()
-    # No exception => idempotent
+    relations2, columns2 = public_schema_snapshot()
+    assert relations1 == relations2, f"relations differ: {sorted(relations1 ^ relations2)}"
+    assert columns1 == columns2, f"columns differ: {sorted(columns1 ^ columns2)}"
+
+
+def test_schema_reset_runs_once_across_xdist_workers(monkeypatch, tmp_path):
+    """Under xdist the first worker resets; later workers see .done and do not reset again (no DB)."""
+    import tests._db_bootstrap as mod
+
+    resets = []
+    monkeypatch.setattr(mod, "run_test_db_schema_fixture", lambda: resets.append(1))
+    for worker in ("gw0", "gw1", "gw2"):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        mod.run_test_db_schema_once(tmp_path)
+    assert resets == [1]
+    assert (tmp_path / "db_schema_reset.done").read_text() == "ok"
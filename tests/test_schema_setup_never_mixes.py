@@ -4,19 +4,30 @@ import os
 
 import pytest
 
+from tests._db_bootstrap import postgres_reachable, run_test_db_schema_fixture
 
+# Read once: the skip condition and the test body use the same URL (DATABASE_URL_TEST wins)
+_DB_URL = os.environ.get("DATABASE_URL_TEST") or os.environ.get("DATABASE_TEST_URL")
+
+# Drops and recreates the shared public schema mid-run: under xdist that would pull it out from
+# under the other workers, whatever their group, so these only run in a single-process session
+pytestmark = pytest.mark.skipif(
+    bool(os.environ.get("PYTEST_XDIST_WORKER")), reason="resets the shared test schema; run without -n"
+)
+
+
+# postgres_reachable is cached per URL, so this shares the session's single probe
 @pytest.mark.skipif(
-    not os.environ.get("DATABASE_URL_TEST") and not os.environ.get("DATABASE_TEST_URL"),
-    reason="DATABASE_URL_TEST required for schema setup test",
+    not (_DB_URL and postgres_reachable(_DB_URL)),
+    reason="DATABASE_URL_TEST required (and reachable) for schema setup test",
 )
 def test_alembic_strategy_does_not_call_ensure_tables(monkeypatch):
     """With TEST_SCHEMA_STRATEGY=alembic, session setup must never call ensure_tables()."""
     monkeypatch.setenv("TEST_SCHEMA_STRATEGY", "alembic")
     monkeypatch.setenv("ENV", "test")
     monkeypatch.setenv("PYTEST_RUNNING", "1")
-    url = os.environ.get("DATABASE_URL_TEST") or os.environ.get("DATABASE_TEST_URL")
-    monkeypatch.setenv("DATABASE_URL", url)
-    monkeypatch.setenv("DATABASE_URL_TEST", url)
+    monkeypatch.setenv("DATABASE_URL", _DB_URL)
+    monkeypatch.setenv("DATABASE_URL_TEST", _DB_URL)
 
     called = []
 
@@ -29,7 +40,5 @@ def test_alembic_strategy_does_not_call_ensure_tables(monkeypatch):
 
     monkeypatch.setattr("apps.api.db.ensure_tables", fail_if_called)
 
-    from tests._db_bootstrap import run_test_db_schema_fixture
-
     run_test_db_schema_fixture()
     assert len(called) == 0, "ensure_tables() was invoked during alembic strategy setup"
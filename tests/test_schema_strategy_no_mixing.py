@@ -7,41 +7,27 @@ import pytest
 from tests._db_bootstrap import assert_not_mixed_schema_setup, get_test_schema_strategy
 
 
-def test_assert_not_mixed_raises_after_both_invoked():
-    """After fixture runs one path, attempting the other raises RuntimeError."""
-    # Reset module state for this test (simulate fresh session)
+@pytest.mark.parametrize(
+    "alembic,ensure_tables,strategy,needles",
+    [
+        (True, True, "alembic", ("Mixed schema setup", "TEST_SCHEMA_STRATEGY")),
+        (False, True, "alembic", ("Cannot run Alembic", "ensure_tables path already ran")),
+        (True, False, "ensure_tables", ("Cannot run ensure_tables", "Alembic path already ran")),
+    ],
+    ids=["both_invoked", "alembic_after_ensure_tables", "ensure_tables_after_alembic"],
+)
+def test_assert_not_mixed_raises(monkeypatch, alembic, ensure_tables, strategy, needles):
+    """Once one schema path ran (or both), attempting the other raises RuntimeError."""
     import tests._db_bootstrap as mod
-    mod._alembic_invoked = True
-    mod._ensure_tables_invoked = True
 
-    with pytest.raises(RuntimeError) as exc:
-        assert_not_mixed_schema_setup("alembic")
-    assert "Mixed schema setup" in str(exc.value)
-    assert "TEST_SCHEMA_STRATEGY" in str(exc.value)
-
-
-def test_assert_not_mixed_raises_alembic_after_ensure_tables():
-    """Trying alembic after ensure_tables ran raises."""
-    import tests._db_bootstrap as mod
-    mod._alembic_invoked = False
-    mod._ensure_tables_invoked = True
-
-    with pytest.raises(RuntimeError) as exc:
-        assert_not_mixed_schema_setup("alembic")
-    assert "Cannot run Alembic" in str(exc.value)
-    assert "ensure_tables path already ran" in str(exc.value)
-
-
-def test_assert_not_mixed_raises_ensure_tables_after_alembic():
-    """Trying ensure_tables after alembic ran raises."""
-    import tests._db_bootstrap as mod
-    mod._alembic_invoked = True
-    mod._ensure_tables_invoked = False
+    # monkeypatch restores the session's real state afterwards
+    state = (mod._ALEMBIC if alembic else 0) | (mod._ENSURE_TABLES if ensure_tables else 0)
+    monkeypatch.setattr(mod, "_setup_state", state)
 
     with pytest.raises(RuntimeError) as exc:
-        assert_not_mixed_schema_setup("ensure_tables")
-    assert "Cannot run ensure_tables" in str(exc.value)
-    assert "Alembic path already ran" in str(exc.value)
+        assert_not_mixed_schema_setup(strategy)
+    for needle in needles:
+        assert needle in str(exc.value)
 
 
 def test_strategy_default_is_alembic():